@@ -13,15 +13,121 @@ The agent processes user requests through multiple stages:
 The graph uses conditional routing to handle different user intents and approval states.
 """
 
+import threading
+
 from langgraph.graph import StateGraph, END
 
 from app.ai_agent.state import AgentState
-from app.ai_agent.nodes import fetch_calendar_events, normalize_calendar_events, compute_free_slots, filter_slots, select_slots, approval_node, create_calendar_events, post_schedule_summary
-from app.ai_agent.nodes.control_nodes import intent_classifier, habit_planner, task_analyzer, execution_decider, clarification_agent, explanation_agent, calendar_insights, insight_manager
+from app.ai_agent.nodes import NODES
 from app.ai_agent.router import route_by_intent, route_by_plan_status, route_by_execution_decision, route_by_approval_state, route_by_intent_after_slots, route_by_intent_after_normalize
 
+# Static (unconditional) edges: (source, target)
+_STATIC_EDGES = (
+    # Static execution pipeline
+    ("fetch_calendar_events", "normalize_calendar_events"),
+    
+    # Calendar analysis pipeline
+    ("insight_manager", "fetch_calendar_events"),
+    
+    # Habits continue from filter_slots to select_slots
+    ("filter_slots", "select_slots"),
+    ("select_slots", "approval_node"),
+    
+    ("create_calendar_events", "post_schedule_summary"),
+    
+    # Terminal edges
+    ("post_schedule_summary", END),
+    ("prefetch_calendar_events", END),  # Result is picked up by fetch_calendar_events
+    ("clarification_agent", END),
+    ("explanation_agent", END),
+    ("calendar_insights", END),
+)
+
+# Conditional edges: (source, router, router result -> target)
+_CONDITIONAL_EDGES = (
+    # Intent
+    ("intent_classifier", route_by_intent, {
+        "HABIT_SCHEDULE": "habit_planner",
+        "TASK_SCHEDULE": "task_analyzer",
+        "PREFETCH_CALENDAR": "prefetch_calendar_events",  # Runs in parallel with task_analyzer (see route_by_intent)
+        "CALENDAR_ANALYSIS": "insight_manager",
+        "UNKNOWN": "clarification_agent",
+    }),
+    
+    # Planning
+    ("habit_planner", route_by_plan_status, {
+        "PLAN_READY": "execution_decider",
+        "NEEDS_CLARIFICATION": "clarification_agent",
+        "PLAN_INFEASIBLE": "explanation_agent",
+    }),
+    
+    # Task planning
+    ("task_analyzer", route_by_plan_status, {
+        "PLAN_READY": "execution_decider",
+        "NEEDS_CLARIFICATION": "clarification_agent",
+        "PLAN_INFEASIBLE": "explanation_agent",
+    }),
+    
+    # Execution
+    ("execution_decider", route_by_execution_decision, {
+        "EXECUTE": "fetch_calendar_events",
+        "DRY_RUN": "explanation_agent",
+        "CANCEL": END,
+    }),
+    
+    # After normalize_calendar_events, route based on intent
+    ("normalize_calendar_events", route_by_intent_after_normalize, {
+        "calendar_insights": "calendar_insights",  # For CALENDAR_ANALYSIS
+        "compute_free_slots": "compute_free_slots",  # For scheduling (HABIT_SCHEDULE, TASK_SCHEDULE)
+    }),
+    
+    # After computing free slots: tasks skip filter_slots, habits go through it
+    ("compute_free_slots", route_by_intent_after_slots, {
+        "select_slots": "select_slots",
+        "filter_slots": "filter_slots",
+    }),
+    
+    # Approval
+    ("approval_node", route_by_approval_state, {
+        "APPROVED": "create_calendar_events",
+        "REJECTED": "execution_decider",
+        "select_slots": "select_slots",  # For tasks when CHANGES_REQUESTED
+        "filter_slots": "filter_slots",  # For habits when CHANGES_REQUESTED
+        "PENDING": END,  # End the graph if the approval is pending
+    }),
+)
+
+# Compiled graph (singleton pattern) - built once per process on first use
+_compiled_agent = None
+_compiled_agent_lock = threading.Lock()
+
 
 def create_agent():
+    """
+    Get the compiled LangGraph agent, building it on first use.
+    
+    The compiled graph holds no per-request state, so a single instance is
+    shared across all callers. The first call builds and compiles the graph
+    (see _build_agent); subsequent calls return the cached instance.
+    
+    Returns:
+        Compiled StateGraph ready to use for processing agent requests.
+        
+    Example:
+        >>> agent = create_agent()
+        >>> result = agent.invoke({"messages": [HumanMessage(content="Schedule daily exercise")]})
+    """
+    global _compiled_agent
+    if _compiled_agent is None:
+        with _compiled_agent_lock:
+            # Re-check inside the lock so concurrent first calls compile only once
+            if _compiled_agent is None:
+                _compiled_agent = _build_agent()
+    return _compiled_agent
+
+
+
+def _build_agent():
     """
     Create and compile a LangGraph agent with tool support.
     
@@ -29,7 +135,7 @@ def create_agent():
     1. Entry: intent_classifier - Determines user intent
     2. Routing by intent:
        - HABIT_SCHEDULE → habit_planner
-       - TASK_SCHEDULE → task_analyzer
+       - TASK_SCHEDULE → task_analyzer, with prefetch_calendar_events in parallel
        - CALENDAR_ANALYSIS → insight_manager → fetch_calendar_events → normalize_calendar_events → calendar_insights → END
        - UNKNOWN → clarification_agent
     3. For habits: habit_planner → execution_decider (via plan_status routing)
@@ -43,140 +149,23 @@ def create_agent():
     
     Returns:
         Compiled StateGraph ready to use for processing agent requests.
-        
-    Example:
-        >>> agent = create_agent()
-        >>> result = agent.invoke({"messages": [HumanMessage(content="Schedule daily exercise")]})
     """
-    # Create the graph
     graph = StateGraph(AgentState)
-    
-    # Add nodes
-    # Register nodes
-    graph.add_node("intent_classifier", intent_classifier.intent_classifier)
-    graph.add_node("habit_planner", habit_planner.habit_planner)
-    graph.add_node("task_analyzer", task_analyzer.task_analyzer)
-    graph.add_node("execution_decider", execution_decider.execution_decider)
-    graph.add_node("clarification_agent", clarification_agent.clarification_agent)
-    graph.add_node("explanation_agent", explanation_agent.explanation_agent)
-    graph.add_node("insight_manager", insight_manager.insight_manager)
-    graph.add_node("calendar_insights", calendar_insights.calendar_insights)
-
-    graph.add_node("fetch_calendar_events", fetch_calendar_events.fetch_calendar_events)
-    graph.add_node("normalize_calendar_events", normalize_calendar_events.normalize_calendar_events)
-    graph.add_node("compute_free_slots", compute_free_slots.compute_free_slots)
-    graph.add_node("filter_slots", filter_slots.filter_slots)
-    graph.add_node("select_slots", select_slots.select_slots)
-    graph.add_node("approval_node", approval_node.approval_node)
-    graph.add_node("create_calendar_events", create_calendar_events.create_calendar_events)
-    graph.add_node("post_schedule_summary", post_schedule_summary.post_schedule_summary)
+    _add_to_graph(graph, NODES.items(), _STATIC_EDGES, _CONDITIONAL_EDGES)
     
     # Entry point
     graph.set_entry_point("intent_classifier")
     
-    # Conditional routing — intent
-    graph.add_conditional_edges(
-        "intent_classifier",
-        route_by_intent,
-        {
-            "HABIT_SCHEDULE": "habit_planner",
-            "TASK_SCHEDULE": "task_analyzer",
-            "CALENDAR_ANALYSIS": "insight_manager",
-            "UNKNOWN": "clarification_agent",
-        },
-    )
-
-    # Conditional routing — planning
-    graph.add_conditional_edges(
-        "habit_planner",
-        route_by_plan_status,
-        {
-            "PLAN_READY": "execution_decider",
-            "NEEDS_CLARIFICATION": "clarification_agent",
-            "PLAN_INFEASIBLE": "explanation_agent",
-        },
-    )
-
-    # Conditional routing — task planning
-    graph.add_conditional_edges(
-        "task_analyzer",
-        route_by_plan_status,
-        {
-            "PLAN_READY": "execution_decider",
-            "NEEDS_CLARIFICATION": "clarification_agent",
-            "PLAN_INFEASIBLE": "explanation_agent",
-        },
-    )
-
-    # Conditional routing — execution
-    graph.add_conditional_edges(
-        "execution_decider",
-        route_by_execution_decision,
-        {
-            "EXECUTE": "fetch_calendar_events",
-            "DRY_RUN": "explanation_agent",
-            "CANCEL": END,
-        },
-    )
-
-    # Static execution pipeline
-    graph.add_edge("fetch_calendar_events", "normalize_calendar_events")
-    
-    # Calendar analysis pipeline
-    graph.add_edge("insight_manager", "fetch_calendar_events")
-    
-    # After normalize_calendar_events, route based on intent
-    # For CALENDAR_ANALYSIS: normalize_calendar_events → calendar_insights
-    # For scheduling: normalize_calendar_events → compute_free_slots
-    graph.add_conditional_edges(
-        "normalize_calendar_events",
-        route_by_intent_after_normalize,
-        {
-            "calendar_insights": "calendar_insights",  # For CALENDAR_ANALYSIS
-            "compute_free_slots": "compute_free_slots",  # For scheduling (HABIT_SCHEDULE, TASK_SCHEDULE)
-        },
-    )
-    
-    # Conditional routing — after computing free slots
-    # Tasks skip filter_slots, habits go through filter_slots
-    graph.add_conditional_edges(
-        "compute_free_slots",
-        route_by_intent_after_slots,
-        {
-            "select_slots": "select_slots",  # Tasks go directly to select_slots
-            "filter_slots": "filter_slots",  # Habits go through filter_slots first
-        },
-    )
-    
-    # Habits continue from filter_slots to select_slots
-    graph.add_edge("filter_slots", "select_slots")
-    graph.add_edge("select_slots", "approval_node")
-    
-    # Conditional routing — approval
-    graph.add_conditional_edges(
-        "approval_node",
-        route_by_approval_state,
-        {
-            "APPROVED": "create_calendar_events",
-            "REJECTED": "execution_decider",
-            "select_slots": "select_slots",  # For tasks when CHANGES_REQUESTED
-            "filter_slots": "filter_slots",  # For habits when CHANGES_REQUESTED
-            "PENDING": END,  # End the graph if the approval is pending
-        },
-    )
-    
-    graph.add_edge("create_calendar_events", "post_schedule_summary")
-    
-    # Terminal edges
-    graph.add_edge("post_schedule_summary", END)
-    graph.add_edge("clarification_agent", END)
-    graph.add_edge("explanation_agent", END)
-    graph.add_edge("calendar_insights", END)
-    
     # Compile the graph
     return graph.compile()
 
-# if __name__ == "__main__":
-#     graph = create_agent()
-#     print("Graph created")
-#     # graph.get_graph().draw_mermaid_png()
+
+def _add_to_graph(graph, nodes, edges, conditional_edges):
+    """Register pre-built node, edge and conditional edge tables on a StateGraph."""
+    for node_name, node_fn in nodes:
+        graph.add_node(node_name, node_fn)
+    for source, path, path_map in conditional_edges:
+        graph.add_conditional_edges(source, path, path_map)
+    for source, target in edges:
+        graph.add_edge(source, target)
+
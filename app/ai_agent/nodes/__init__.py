@@ -1,6 +1,34 @@
 """Node implementations for LangGraph agents."""
 
+from langchain_core.runnables import RunnableLambda
+
 from app.ai_agent.nodes.agent_node import agent_node
 from app.ai_agent.nodes.tool_node import tool_node
+from app.ai_agent.nodes import fetch_calendar_events, normalize_calendar_events, compute_free_slots, filter_slots, select_slots, approval_node, create_calendar_events, post_schedule_summary
+from app.ai_agent.nodes.control_nodes import intent_classifier, habit_planner, task_analyzer, execution_decider, clarification_agent, explanation_agent, calendar_insights, insight_manager
+
+# Node registry for the agent graph: node name -> node function
+NODES = {
+    "intent_classifier": RunnableLambda(intent_classifier.intent_classifier, afunc=intent_classifier.aintent_classifier, name="intent_classifier"),
+    "habit_planner": RunnableLambda(habit_planner.habit_planner, afunc=habit_planner.ahabit_planner, name="habit_planner"),
+    "task_analyzer": RunnableLambda(task_analyzer.task_analyzer, afunc=task_analyzer.atask_analyzer, name="task_analyzer"),
+    "execution_decider": execution_decider.execution_decider,
+    "clarification_agent": clarification_agent.clarification_agent,
+    "explanation_agent": RunnableLambda(explanation_agent.explanation_agent, afunc=explanation_agent.aexplanation_agent, name="explanation_agent"),
+    "insight_manager": RunnableLambda(insight_manager.insight_manager, afunc=insight_manager.ainsight_manager, name="insight_manager"),
+    "calendar_insights": RunnableLambda(calendar_insights.calendar_insights, afunc=calendar_insights.acalendar_insights, name="calendar_insights"),
+
+    # The calendar request runs in a worker thread under ainvoke(), so it overlaps with parallel nodes
+    "fetch_calendar_events": RunnableLambda(fetch_calendar_events.fetch_calendar_events, afunc=fetch_calendar_events.afetch_calendar_events, name="fetch_calendar_events"),
+    "prefetch_calendar_events": RunnableLambda(fetch_calendar_events.prefetch_calendar_events, afunc=fetch_calendar_events.aprefetch_calendar_events, name="prefetch_calendar_events"),
+    "normalize_calendar_events": normalize_calendar_events.normalize_calendar_events,
+    "compute_free_slots": compute_free_slots.compute_free_slots,
+    "filter_slots": filter_slots.filter_slots,
+    "select_slots": select_slots.select_slots,
+    # Sync and async implementations, so both invoke() and ainvoke() run natively
+    "approval_node": RunnableLambda(approval_node.approval_node, afunc=approval_node.aapproval_node, name="approval_node"),
+    "create_calendar_events": create_calendar_events.create_calendar_events,
+    "post_schedule_summary": post_schedule_summary.post_schedule_summary,
+}
 
-__all__ = ["agent_node", "tool_node"]
+__all__ = ["agent_node", "tool_node", "NODES"]
@@ -1,6 +1,7 @@
 """Agent node implementation for processing conversation state."""
 
 from langchain_openai import ChatOpenAI
+from langchain_core.messages import message_chunk_to_message
 
 from app.ai_agent.state import AgentState
 from app.ai_agent.tools import (
@@ -9,6 +10,23 @@ from app.ai_agent.tools import (
     find_available_slots_tool
 )
 
+# LLM with bound tools (singleton pattern) - created on first use so that
+# importing this module does not require OPENAI_API_KEY to be set
+_llm_with_tools = None
+
+
+def get_llm_with_tools():
+    """Get or create the tool-bound LLM instance."""
+    global _llm_with_tools
+    if _llm_with_tools is None:
+        llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
+        _llm_with_tools = llm.bind_tools([
+            get_calendar_events_tool,
+            create_calendar_event_tool,
+            find_available_slots_tool
+        ])
+    return _llm_with_tools
+
 
 def agent_node(state: AgentState) -> AgentState:
     """
@@ -20,22 +38,21 @@ def agent_node(state: AgentState) -> AgentState:
     Returns:
         Updated state with AI response (may include tool calls)
     """
-    # Initialize the LLM
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
-    
-    # Bind tools to the LLM
-    tools = [
-        get_calendar_events_tool,
-        create_calendar_event_tool,
-        find_available_slots_tool
-    ]
-    llm_with_tools = llm.bind_tools(tools)
-    
     # Get messages from state
     messages = state["messages"]
     
-    # Generate response using the LLM (may include tool calls)
-    response = llm_with_tools.invoke(messages)
+    # Stream the response (may include tool calls) and stop as soon as the
+    # model reports it has finished emitting tool calls
+    response = None
+    for chunk in get_llm_with_tools().stream(messages):
+        response = chunk if response is None else response + chunk
+        if chunk.response_metadata.get("finish_reason") == "tool_calls":
+            break
+    if response is None:
+        # The stream produced no chunks; fall back to a regular call so there is always a message
+        response = get_llm_with_tools().invoke(messages)
+    else:
+        response = message_chunk_to_message(response)
     
-    # Add the AI response to the messages
-    return {"messages": messages + [response]}
+    # Return only the AI response; the messages reducer appends it to the history
+    return {"messages": [response]}
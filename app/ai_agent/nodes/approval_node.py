@@ -1,49 +1,103 @@
 """Approval node - handles approval flow for selected slots before creating events."""
 
+import logging
+import os
+import re
+from functools import lru_cache
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import Dict, List, Optional, Tuple
 
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import AIMessage
+from langchain_core.caches import InMemoryCache
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
 
+from app.ai_agent.nodes.control_nodes._llm import get_chat_model
 from app.ai_agent.state import AgentState
 
+logger = logging.getLogger(__name__)
+
+_ISO_DATETIME_PREFIX = re.compile(r"\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}")
+
+# Prompt for LLM-generated approval messages. The system message is identical on
+# every call so OpenAI's prompt caching can reuse its prefix. Slot details are left
+# out: the message should not repeat them and the approval box shows them.
+_APPROVAL_SYSTEM_MESSAGE = SystemMessage(content="""You are a helpful assistant asking the user to approve a schedule. Be friendly, conversational, and concise. 
+Briefly mention what you found and ask them to review and approve. Don't repeat all the details - they'll see them in the approval box.""")
+_APPROVAL_USER_TEMPLATE = "Ask the user to approve {slot_count} scheduled time slot(s) for {item_text}. Be brief."
+
+# Approval prompts depend only on the habit/task definition and the slot count,
+# so retries and re-approvals can reuse the generated message
+_approval_message_cache = InMemoryCache(maxsize=1024)
+
+
+@lru_cache(maxsize=None)
+def get_approval_llm():
+    """
+    Get the LLM used for approval messages.
+    
+    The shared gpt-4o-mini client (same pooled HTTP transport and timeouts as the
+    control nodes), streamed so the API can forward tokens while the message is
+    generated, and backed by the approval message cache.
+    """
+    return get_chat_model("gpt-4o-mini", 0.7).model_copy(update={"streaming": True, "cache": _approval_message_cache})
+
 
 def approval_node(state: AgentState) -> AgentState:
     """
     Handle approval flow for selected slots.
     
-    Reads: selected_slots, habit_definition or task_definition, approval_state, approval_feedback, messages, intent_type
+    Reads: selected_slots, habit_definition or task_definition, approval_state, approval_feedback, intent_type
     Writes: messages (append AIMessage when approval needed), approval_state, explanation_payload
     """
-    print("=" * 50)
-    print("Approval Node: Starting approval flow")
-    print("=" * 50)
+    result, prompt = _prepare_approval(state)
+    if prompt is None:
+        return result
     
-    selected_slots = state.get("selected_slots", [])
-    habit_definition = state.get("habit_definition", {})
-    task_definition = state.get("task_definition", {})
-    intent_type = state.get("intent_type", "UNKNOWN")
+    logger.debug("Approval Node: Invoking LLM to generate approval message...")
+    response = get_approval_llm().invoke(prompt)
+    return _complete_approval(result, response)
+
+
+async def aapproval_node(state: AgentState) -> AgentState:
+    """Async variant of approval_node; awaits the LLM call instead of blocking on it."""
+    result, prompt = _prepare_approval(state)
+    if prompt is None:
+        return result
+    
+    logger.debug("Approval Node: Invoking LLM to generate approval message...")
+    response = await get_approval_llm().ainvoke(prompt)
+    return _complete_approval(result, response)
+
+
+def _prepare_approval(state: AgentState) -> Tuple[Dict, Optional[List[BaseMessage]]]:
+    """
+    Resolve the approval flow up to the LLM call.
+    
+    Returns (result, None) when no LLM call is needed (approval state already
+    decided, or templated approval message), or (pending result without
+    messages, prompt for the approval message).
+    """
     current_approval_state = state.get("approval_state")
-    approval_feedback = state.get("approval_feedback")
     
-    # Determine if this is a task or habit
-    is_task = bool(task_definition) or intent_type == "TASK_SCHEDULE"
+    # Resuming after the user approved: nothing else to read or build
+    if current_approval_state == "APPROVED":
+        return {"approval_state": "APPROVED"}, None
     
-    print(f"Approval Node: Number of selected slots = {len(selected_slots)}")
-    print(f"Approval Node: Current approval state = {current_approval_state}")
-    print(f"Approval Node: Intent type = {intent_type}")
-    print(f"Approval Node: Processing as {'TASK' if is_task else 'HABIT'}")
+    logger.debug("Approval Node: Starting approval flow")
+    
+    selected_slots = state.get("selected_slots", [])
+    approval_feedback = state.get("approval_feedback")
+    
+    logger.debug("Approval Node: Number of selected slots = %s", len(selected_slots))
+    logger.debug("Approval Node: Current approval state = %s", current_approval_state)
     
     # If approval state is already set (from external input), use it
-    if current_approval_state in ["APPROVED", "REJECTED", "CHANGES_REQUESTED"]:
-        print(f"Approval Node: Approval state already set to {current_approval_state}")
+    if current_approval_state in ("REJECTED", "CHANGES_REQUESTED"):
+        logger.debug("Approval Node: Approval state already set to %s", current_approval_state)
         
         if current_approval_state == "REJECTED":
             # Generate explanation for rejection
             feedback = approval_feedback or "Scheduling was rejected by user"
-            print("Approval Node: Returning REJECTED state")
-            print("=" * 50)
+            logger.debug("Approval Node: Returning REJECTED state")
             return {
                 "approval_state": "REJECTED",
                 "approval_feedback": feedback,
@@ -52,12 +106,11 @@ def approval_node(state: AgentState) -> AgentState:
                     "message": feedback,
                     "selected_slots": selected_slots
                 }
-            }
+            }, None
         elif current_approval_state == "CHANGES_REQUESTED":
             # Generate explanation for changes requested
             feedback = approval_feedback or "Changes requested by user"
-            print("Approval Node: Returning CHANGES_REQUESTED state")
-            print("=" * 50)
+            logger.debug("Approval Node: Returning CHANGES_REQUESTED state")
             return {
                 "approval_state": "CHANGES_REQUESTED",
                 "approval_feedback": feedback,
@@ -67,19 +120,11 @@ def approval_node(state: AgentState) -> AgentState:
                     "selected_slots": selected_slots,
                     "suggested_changes": feedback
                 }
-            }
-        elif current_approval_state == "APPROVED":
-            # Approved, can proceed
-            print("Approval Node: Returning APPROVED state")
-            print("=" * 50)
-            return {
-                "approval_state": "APPROVED"
-            }
+            }, None
     
     # If no approval state set yet, set to PENDING and generate summary
     if not selected_slots:
-        print("Approval Node: No slots selected, setting approval to REJECTED")
-        print("=" * 50)
+        logger.debug("Approval Node: No slots selected, setting approval to REJECTED")
         return {
             "approval_state": "REJECTED",
             "approval_feedback": "No slots were selected for scheduling",
@@ -87,101 +132,49 @@ def approval_node(state: AgentState) -> AgentState:
                 "reason": "No slots available",
                 "message": "No suitable time slots were found for scheduling."
             }
-        }
+        }, None
     
-    # Generate summary of selected slots for approval
+    habit_definition = state.get("habit_definition", {})
+    task_definition = state.get("task_definition", {})
+    intent_type = state.get("intent_type", "UNKNOWN")
+    
+    # Determine if this is a task or habit
+    is_task = bool(task_definition) or intent_type == "TASK_SCHEDULE"
+    
+    logger.debug("Approval Node: Intent type = %s", intent_type)
+    logger.debug("Approval Node: Processing as %s", 'TASK' if is_task else 'HABIT')
+    
+    # Item details; item_text describes the task or habit in the summary and approval message
     if is_task:
         # Task-specific information
         item_name = task_definition.get("task_name", "Scheduled Task")
         priority = task_definition.get("priority", "MEDIUM")
         duration_minutes = task_definition.get("estimated_time_minutes", 30)
         description = task_definition.get("description", "")
-        print(f"Approval Node: Task name = {item_name}")
-        print(f"Approval Node: Priority = {priority}")
-        print(f"Approval Node: Estimated duration = {duration_minutes} minutes")
+        item_text = f"task '{item_name}' (Priority: {priority}, {duration_minutes} min)"
+        logger.debug("Approval Node: Task name = %s", item_name)
+        logger.debug("Approval Node: Priority = %s", priority)
+        logger.debug("Approval Node: Estimated duration = %s minutes", duration_minutes)
     else:
         # Habit-specific information
         item_name = habit_definition.get("habit_name", "Scheduled Habit")
         frequency = habit_definition.get("frequency", "unknown")
         duration_minutes = habit_definition.get("duration_minutes", 30)
-        print(f"Approval Node: Habit name = {item_name}")
-        print(f"Approval Node: Frequency = {frequency}")
-        print(f"Approval Node: Duration = {duration_minutes} minutes")
-    
-    # Format slots summary
-    # Always calculate duration_minutes from end_time - start_time
-    # Do not modify start/end times - just pass through the actual slot info
-    slots_summary = []
-    for i, slot in enumerate(selected_slots, 1):
-        try:
-            start_time = datetime.fromisoformat(slot["start"])
-            end_time = datetime.fromisoformat(slot["end"])
-            
-            # Always calculate duration_minutes from actual start and end times
-            slot_duration_minutes = int((end_time - start_time).total_seconds() / 60)
-            
-            slots_summary.append({
-                "slot_number": i,
-                "date": start_time.strftime("%Y-%m-%d"),
-                "time": start_time.strftime("%H:%M"),
-                "duration_minutes": slot_duration_minutes,  # Always calculated from end_time - start_time
-                "start": slot["start"],  # Pass through original start time
-                "end": slot["end"]  # Pass through original end time
-            })
-        except (ValueError, KeyError) as e:
-            print(f"Approval Node: Skipping invalid slot - {type(e).__name__}: {e}")
-            continue
-    
-    # Generate summary message based on task or habit
-    if is_task:
-        summary_message = f"Ready to schedule task '{item_name}' (Priority: {priority}, {duration_minutes} min) in {len(selected_slots)} time slot(s):\n"
-    else:
-        summary_message = f"Ready to schedule '{item_name}' ({frequency}, {duration_minutes} min) in {len(selected_slots)} time slot(s):\n"
-    
-    for slot_info in slots_summary:
-        summary_message += f"  - {slot_info['date']} at {slot_info['time']} ({slot_info['duration_minutes']} min)\n"
-    
-    print(f"Approval Node: Generated approval summary:\n{summary_message}")
-    
-    # Generate a friendly, conversational message asking for approval
-    messages = state.get("messages", [])
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
-    
-    # Format slots for the LLM prompt
-    slots_text = "\n".join([
-        f"- {slot_info['date']} at {slot_info['time']} ({slot_info['duration_minutes']} minutes)"
-        for slot_info in slots_summary
-    ])
-    
-    system_prompt = """You are a helpful assistant asking the user to approve a schedule. Be friendly, conversational, and concise. 
-Briefly mention what you found and ask them to review and approve. Don't repeat all the details - they'll see them in the approval box."""
-    
-    # Create different prompts for tasks vs habits
-    if is_task:
-        prompt = f"""{system_prompt}
-
-I found {len(selected_slots)} time slot(s) for task '{item_name}' (Priority: {priority}, {duration_minutes} minutes):
-{slots_text}
-
-Your friendly message asking for approval:"""
-    else:
-        prompt = f"""{system_prompt}
-
-I found {len(selected_slots)} time slot(s) for '{item_name}' ({frequency}, {duration_minutes} minutes):
-{slots_text}
-
-Your friendly message asking for approval:"""
+        item_text = f"'{item_name}' ({frequency}, {duration_minutes} min)"
+        logger.debug("Approval Node: Habit name = %s", item_name)
+        logger.debug("Approval Node: Frequency = %s", frequency)
+        logger.debug("Approval Node: Duration = %s minutes", duration_minutes)
     
-    print(f"Approval Node: Invoking LLM to generate approval message...")
-    response = llm.invoke(prompt)
-    approval_message = AIMessage(content=response.content)
+    # Generate summary of selected slots for approval
+    slots_summary = _build_slots_summary(selected_slots)
+    summary_message = _build_summary_message(item_text, len(selected_slots), slots_summary)
     
-    print(f"Approval Node: LLM generated approval message: {response.content[:100]}...")
+    logger.debug("Approval Node: Generated approval summary:\n%s", summary_message)
     
     # Set to PENDING to require human approval
     # The approval state will be updated by the frontend when user responds
     approval_state = "PENDING"
-    print("Approval Node: Setting approval state to PENDING - waiting for user approval")
+    logger.debug("Approval Node: Setting approval state to PENDING - waiting for user approval")
     
     # Build explanation payload based on task or habit
     explanation_payload = {
@@ -204,12 +197,107 @@ Your friendly message asking for approval:"""
             "duration_minutes": duration_minutes
         })
     
-    print("Approval Node: Approval flow complete")
-    print("=" * 50)
-    
-    return {
-        "messages": messages + [approval_message],
+    result = {
         "approval_state": approval_state,
         "explanation_payload": explanation_payload
     }
+    
+    if not _use_llm_approval_message():
+        # The approval box already shows the slot details, so a fixed message is enough
+        approval_message = _render_approval_message(item_text, len(selected_slots))
+        logger.debug("Approval Node: Using templated approval message")
+        return {"messages": [AIMessage(content=approval_message)], **result}, None
+    
+    # Prompt for a friendly, conversational message asking for approval
+    prompt = [
+        _APPROVAL_SYSTEM_MESSAGE,
+        HumanMessage(content=_APPROVAL_USER_TEMPLATE.format(slot_count=len(selected_slots), item_text=item_text)),
+    ]
+    
+    return result, prompt
+
+
+def _build_slots_summary(selected_slots: List[Dict]) -> List[Dict]:
+    """
+    Format selected slots for display, skipping slots with invalid boundaries.
+    
+    duration_minutes is always calculated from end - start; the original
+    start/end strings are passed through unchanged.
+    """
+    slots_summary = []
+    for i, slot in enumerate(selected_slots, 1):
+        slot_start = slot.get("start")
+        slot_end = slot.get("end")
+        
+        # Skip malformed boundaries up front instead of raising inside fromisoformat
+        if not (_is_iso_datetime(slot_start) and _is_iso_datetime(slot_end)):
+            logger.warning("Approval Node: Skipping invalid slot - start=%r, end=%r", slot_start, slot_end)
+            continue
+        
+        try:
+            start_time = _parse_iso_datetime(slot_start)
+            end_time = _parse_iso_datetime(slot_end)
+        except ValueError as e:
+            # Well-formed but out of range (e.g. month 13)
+            logger.warning("Approval Node: Skipping invalid slot - %s: %s", type(e).__name__, e)
+            continue
+        
+        slots_summary.append({
+            "slot_number": i,
+            # Boundaries are validated as "YYYY-MM-DDTHH:MM...", so the local
+            # date and time can be sliced straight out of the string
+            "date": slot_start[:10],
+            "time": slot_start[11:16],
+            "duration_minutes": _whole_minutes(end_time - start_time),
+            "start": slot_start,
+            "end": slot_end
+        })
+    return slots_summary
+
+
+def _build_summary_message(item_text: str, slot_count: int, slots_summary: List[Dict]) -> str:
+    """Build the plain-text schedule summary shown in the approval payload."""
+    summary_lines = [f"Ready to schedule {item_text} in {slot_count} time slot(s):"]
+    summary_lines.extend(
+        f"  - {slot_info['date']} at {slot_info['time']} ({slot_info['duration_minutes']} min)"
+        for slot_info in slots_summary
+    )
+    return "\n".join(summary_lines) + "\n"
+
+
+def _complete_approval(result: Dict, response) -> Dict:
+    """Attach the LLM-generated approval message to a pending approval result."""
+    logger.debug("Approval Node: LLM generated approval message: %s...", response.content[:100])
+    logger.debug("Approval Node: Approval flow complete")
+    
+    return {"messages": [AIMessage(content=response.content)], **result}
+
+
+def _use_llm_approval_message() -> bool:
+    """Whether the approval message is generated by the LLM (USE_LLM_APPROVAL_MSG=true) instead of the template."""
+    return os.getenv("USE_LLM_APPROVAL_MSG", "false").strip().lower() == "true"
+
+
+def _render_approval_message(item_text: str, slot_count: int) -> str:
+    """Render the templated message asking the user to approve the selected slots."""
+    return (
+        f"I found {slot_count} time slot(s) for {item_text}. "
+        "Please review them below and approve, reject, or request changes."
+    )
+
+
+def _is_iso_datetime(value) -> bool:
+    """Whether value is a string starting with an ISO 8601 date and time (YYYY-MM-DDTHH:MM)."""
+    return isinstance(value, str) and _ISO_DATETIME_PREFIX.match(value) is not None
+
+
+def _whole_minutes(delta: timedelta) -> int:
+    """Whole minutes in a timedelta, truncated toward zero, using integer arithmetic only."""
+    microseconds = (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    return microseconds // 60_000_000 if microseconds >= 0 else -(-microseconds // 60_000_000)
+
 
+@lru_cache(maxsize=4096)
+def _parse_iso_datetime(value: str) -> datetime:
+    """Parse an ISO 8601 slot boundary, reusing results for repeated strings (datetimes are immutable)."""
+    return datetime.fromisoformat(value)
@@ -1,10 +1,16 @@
 """Compute free slots node - calculates available time windows."""
 
+import logging
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict
+from functools import lru_cache
+from operator import itemgetter
+from typing import Dict, List, Tuple
 
+from app.ai_agent.nodes.normalize_calendar_events import parse_iso, to_epoch_seconds
 from app.ai_agent.state import AgentState
 
+logger = logging.getLogger(__name__)
+
 
 def compute_free_slots(state: AgentState) -> AgentState:
     """
@@ -13,111 +19,118 @@ def compute_free_slots(state: AgentState) -> AgentState:
     Reads: calendar_events_normalized, time_range (from planning_horizon)
     Writes: free_time_slots
     """
-    print("=" * 50)
-    print("Compute Free Slots: Starting free slot computation")
-    print("=" * 50)
+    logger.debug("Compute Free Slots: Starting free slot computation")
     
     normalized_events = state.get("calendar_events_normalized", [])
     planning_horizon = state.get("planning_horizon", {})
     
-    print(f"Compute Free Slots: Number of normalized events = {len(normalized_events)}")
-    print(f"Compute Free Slots: Planning horizon = {planning_horizon}")
+    logger.debug("Compute Free Slots: Number of normalized events = %s", len(normalized_events))
+    logger.debug("Compute Free Slots: Planning horizon = %s", planning_horizon)
     
     # Get time range
     start_date = planning_horizon.get("start_date")
     end_date = planning_horizon.get("end_date")
     
-    if not start_date:
-        # Use UTC timezone for timezone-aware datetime
-        start_date = datetime.now(timezone.utc)
-    else:
-        if isinstance(start_date, str):
-            start_date = datetime.fromisoformat(start_date.replace('Z', '+00:00'))
-        # Ensure timezone-aware
-        if start_date.tzinfo is None:
-            start_date = start_date.replace(tzinfo=timezone.utc)
-    
-    if not end_date:
-        end_date = start_date + timedelta(days=30)
-    else:
-        if isinstance(end_date, str):
-            end_date = datetime.fromisoformat(end_date.replace('Z', '+00:00'))
-        # Ensure timezone-aware
-        if end_date.tzinfo is None:
-            end_date = end_date.replace(tzinfo=timezone.utc)
-    
-    print(f"Compute Free Slots: Start date = {start_date}")
-    print(f"Compute Free Slots: End date = {end_date}")
-    print(f"Compute Free Slots: Time range = {end_date - start_date}")
-    
-    # Convert events to datetime ranges
+    # Use UTC timezone for timezone-aware defaults
+    start_date = _as_aware_datetime(start_date) if start_date else datetime.now(timezone.utc)
+    end_date = _as_aware_datetime(end_date) if end_date else start_date + timedelta(days=30)
+    
+    logger.debug("Compute Free Slots: Start date = %s", start_date)
+    logger.debug("Compute Free Slots: End date = %s", end_date)
+    logger.debug("Compute Free Slots: Time range = %s", end_date - start_date)
+    
+    # Convert events to epoch-second ranges, keeping the original ISO strings
+    # so only the boundaries that end up in a free slot need formatting
     busy_periods = []
-    print(f"Compute Free Slots: Processing {len(normalized_events)} normalized events...")
+    logger.debug("Compute Free Slots: Processing %s normalized events...", len(normalized_events))
     for event in normalized_events:
         try:
-            event_start = datetime.fromisoformat(event["start"].replace("Z", "+00:00"))
-            event_end = datetime.fromisoformat(event["end"].replace("Z", "+00:00"))
-            busy_periods.append((event_start, event_end))
+            event_start_ts = event.get("start_ts")
+            event_end_ts = event.get("end_ts")
+            if event_start_ts is None or event_end_ts is None:
+                # Not pre-parsed by normalize_calendar_events
+                event_start_ts = to_epoch_seconds(event["start"])
+                event_end_ts = to_epoch_seconds(event["end"])
+            busy_periods.append((event_start_ts, event_end_ts, event["start"], event["end"]))
         except (ValueError, KeyError) as e:
-            print(f"Compute Free Slots: Skipping invalid event - {type(e).__name__}: {e}")
+            logger.warning("Compute Free Slots: Skipping invalid event - %s: %s", type(e).__name__, e)
             continue
     
-    print(f"Compute Free Slots: Extracted {len(busy_periods)} busy periods")
+    logger.debug("Compute Free Slots: Extracted %s busy periods", len(busy_periods))
+    
+    free_slots = _sweep_free_slots(busy_periods, start_date, end_date)
+    
+    logger.debug("Compute Free Slots: Computed %s free time slots", len(free_slots))
+    if free_slots and logger.isEnabledFor(logging.DEBUG):
+        total_free_time = sum(slot.get("duration_minutes", 0) for slot in free_slots)
+        logger.debug("Compute Free Slots: Total free time = %s minutes (%.2f hours)", total_free_time, total_free_time / 60)
+        logger.debug("Compute Free Slots: Sample slots (first 3):")
+        for i, slot in enumerate(free_slots[:3]):
+            logger.debug("  Slot %s: %s to %s (%s minutes)", i+1, slot.get('start'), slot.get('end'), slot.get('duration_minutes'))
+    
+    logger.debug("Compute Free Slots: Free slot computation complete")
     
-    # Sort busy periods by start time
-    busy_periods.sort(key=lambda x: x[0])
-    print(f"Compute Free Slots: Sorted busy periods by start time")
+    return {"free_time_slots": free_slots}
+
+
+def _sweep_free_slots(busy_periods: List[Tuple[int, int, str, str]], start_date: datetime, end_date: datetime) -> List[Dict]:
+    """
+    Compute free slots between start_date and end_date around the busy periods.
+    
+    busy_periods holds (start_ts, end_ts, start_iso, end_iso) tuples in any order.
+    """
+    # Sort busy periods by start time, then end time (C-level key, stable for identical ranges)
+    busy_periods = sorted(busy_periods, key=itemgetter(0, 1))
+    logger.debug("Compute Free Slots: Sorted busy periods by start time")
     
-    # Compute free slots
     free_slots: List[Dict] = []
     current_time = start_date
     
     # Round current_time to the nearest hour for cleaner slots
     current_time = current_time.replace(minute=0, second=0, microsecond=0)
-    print(f"Compute Free Slots: Starting computation from {current_time}")
+    logger.debug("Compute Free Slots: Starting computation from %s", current_time)
+    
+    current_ts = int(current_time.timestamp())
+    current_iso = current_time.isoformat()
     
-    for busy_start, busy_end in busy_periods:
+    # Single sweep over the sorted busy periods: overlapping and back-to-back
+    # periods only push current_ts forward, so each gap is emitted exactly once
+    for busy_start_ts, busy_end_ts, busy_start_iso, busy_end_iso in busy_periods:
         # If there's a gap before this busy period, it's a free slot
-        if current_time < busy_start:
+        if current_ts < busy_start_ts:
             free_slots.append({
-                "start": current_time.isoformat(),
-                "end": busy_start.isoformat(),
-                "duration_minutes": int((busy_start - current_time).total_seconds() / 60)
+                "start": _to_isoformat(current_iso),
+                "end": _to_isoformat(busy_start_iso),
+                "duration_minutes": (busy_start_ts - current_ts) // 60
             })
         
         # Move current_time to after this busy period
-        if busy_end > current_time:
-            current_time = busy_end
-    
-    # Add final free slot if there's time remaining
-    if current_time < end_date:
-        final_slot_duration = int((end_date - current_time).total_seconds() / 60)
-        print(f"Compute Free Slots: Adding final free slot from {current_time} to {end_date} ({final_slot_duration} minutes)")
+        if busy_end_ts > current_ts:
+            current_ts = busy_end_ts
+            current_iso = busy_end_iso
+    
+    # Add final free slot if there's time remaining (the whole range when there are no events)
+    end_ts = int(end_date.timestamp())
+    if current_ts < end_ts:
+        final_slot_duration = (end_ts - current_ts) // 60
+        logger.debug("Compute Free Slots: Adding final free slot from %s to %s (%s minutes)", current_iso, end_date, final_slot_duration)
         free_slots.append({
-            "start": current_time.isoformat(),
+            "start": _to_isoformat(current_iso),
             "end": end_date.isoformat(),
             "duration_minutes": final_slot_duration
         })
     
-    # If no events, the entire range is free
-    if not busy_periods:
-        total_duration = int((end_date - start_date).total_seconds() / 60)
-        print(f"Compute Free Slots: No busy periods found, entire range is free ({total_duration} minutes)")
-        free_slots.append({
-            "start": start_date.isoformat(),
-            "end": end_date.isoformat(),
-            "duration_minutes": total_duration
-        })
-    
-    print(f"Compute Free Slots: Computed {len(free_slots)} free time slots")
-    if free_slots:
-        total_free_time = sum(slot.get("duration_minutes", 0) for slot in free_slots)
-        print(f"Compute Free Slots: Total free time = {total_free_time} minutes ({total_free_time / 60:.2f} hours)")
-        print(f"Compute Free Slots: Sample slots (first 3):")
-        for i, slot in enumerate(free_slots[:3]):
-            print(f"  Slot {i+1}: {slot.get('start')} to {slot.get('end')} ({slot.get('duration_minutes')} minutes)")
-    
-    print("Compute Free Slots: Free slot computation complete")
-    print("=" * 50)
-    
-    return {"free_time_slots": free_slots}
\ No newline at end of file
+    return free_slots
+
+
+def _as_aware_datetime(value) -> datetime:
+    """Parse an ISO string if needed and return a timezone-aware datetime (naive values are taken as UTC)."""
+    if isinstance(value, str):
+        value = parse_iso(value)
+    return value if value.tzinfo is not None else value.replace(tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=4096)
+def _to_isoformat(value: str) -> str:
+    """Return an ISO 8601 string in datetime.isoformat() form (e.g. 'Z' becomes '+00:00')."""
+    return parse_iso(value).isoformat()
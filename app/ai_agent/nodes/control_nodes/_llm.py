@@ -0,0 +1,111 @@
+"""Shared chat model instances for the control nodes."""
+
+import re
+import threading
+from functools import lru_cache
+from typing import AsyncIterator, Iterator, Optional, Tuple
+
+import httpx
+from langchain_openai import ChatOpenAI
+
+# Connection pool shared by every model in the process, so warm connections to the
+# API are reused across nodes instead of each model opening its own
+_HTTP_LIMITS = httpx.Limits(max_keepalive_connections=20, max_connections=100, keepalive_expiry=30.0)
+# Stalled connects and pool waits fail fast; reads allow for long generations
+_HTTP_TIMEOUT = httpx.Timeout(connect=2.0, read=30.0, write=10.0, pool=5.0)
+
+# Top-level status field of the planning responses; the prompts ask for it first
+_PLAN_STATUS_PATTERN = re.compile(r'"plan_status"\s*:\s*"(\w+)"')
+
+# HTTP clients (singleton pattern) - created on first use, see get_chat_model
+_http_client = None
+_http_async_client = None
+_http_clients_lock = threading.Lock()
+
+
+def _get_http_clients():
+    """Get or create the shared sync and async HTTP clients."""
+    global _http_client, _http_async_client
+    if _http_client is None:
+        with _http_clients_lock:
+            # Re-check inside the lock so concurrent first calls share one pool
+            if _http_client is None:
+                _http_async_client = httpx.AsyncClient(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+                _http_client = httpx.Client(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT)
+    return _http_client, _http_async_client
+
+
+@lru_cache(maxsize=None)
+def _get_base_model(model: str) -> ChatOpenAI:
+    """
+    Get or create the one ChatOpenAI client for a model.
+
+    Created on first use (not at import) so the module loads without OPENAI_API_KEY;
+    all models share one pooled HTTP transport.
+    """
+    http_client, http_async_client = _get_http_clients()
+    return ChatOpenAI(
+        model=model,
+        # Also passed per request: the OpenAI SDK would otherwise send timeout=None
+        timeout=_HTTP_TIMEOUT,
+        http_client=http_client,
+        http_async_client=http_async_client,
+    )
+
+
+@lru_cache(maxsize=None)
+def get_chat_model(model: str, temperature: float) -> ChatOpenAI:
+    """
+    Get the chat model for a model/temperature pair.
+
+    A shallow copy of the model's base instance with only the temperature changed, so
+    every temperature reuses the same OpenAI client and auth context. (A copy rather
+    than .bind(temperature=...) so with_structured_output() keeps the temperature.)
+    """
+    return _get_base_model(model).model_copy(update={"temperature": temperature})
+
+
+@lru_cache(maxsize=None)
+def get_json_chat_model(model: str, temperature: float):
+    """
+    Get the chat model for a model/temperature pair bound to OpenAI JSON mode.
+
+    Responses are a single JSON object with no markdown fences or surrounding prose
+    (the prompt itself must still ask for JSON).
+    """
+    return get_chat_model(model, temperature).bind(response_format={"type": "json_object"})
+
+
+def stream_until_status(chunks: Iterator, abort_status: str) -> Tuple[str, Optional[str]]:
+    """
+    Collect a streamed JSON response, stopping early once plan_status is abort_status.
+
+    Returns (response text so far, plan_status if it was seen). Closing the stream
+    on abort cancels the rest of the generation, so no more output tokens are spent.
+    """
+    text, status = "", None
+    for chunk in chunks:
+        text += chunk.content
+        if status is None:
+            match = _PLAN_STATUS_PATTERN.search(text)
+            if match:
+                status = match.group(1)
+                if status == abort_status:
+                    chunks.close()
+                    break
+    return text, status
+
+
+async def astream_until_status(chunks: AsyncIterator, abort_status: str) -> Tuple[str, Optional[str]]:
+    """Async variant of stream_until_status."""
+    text, status = "", None
+    async for chunk in chunks:
+        text += chunk.content
+        if status is None:
+            match = _PLAN_STATUS_PATTERN.search(text)
+            if match:
+                status = match.group(1)
+                if status == abort_status:
+                    await chunks.aclose()
+                    break
+    return text, status
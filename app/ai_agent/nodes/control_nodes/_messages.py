@@ -0,0 +1,36 @@
+"""Helpers for locating the user's message in the conversation."""
+
+from typing import List, Optional
+
+from langchain_core.messages import HumanMessage
+
+from app.ai_agent.state import AgentState
+
+
+def find_last_user_message_index(messages: List) -> Optional[int]:
+    """Scan backwards for the most recent HumanMessage (normally the last message, so O(1) in practice)."""
+    for index in range(len(messages) - 1, -1, -1):
+        if isinstance(messages[index], HumanMessage):
+            return index
+    return None
+
+
+def get_last_user_message(state: AgentState) -> Optional[str]:
+    """
+    Return the content of the last user message.
+
+    Uses last_user_msg_index (recorded by intent_classifier at the start of the run)
+    and falls back to scanning the messages when it is missing or out of range.
+    """
+    messages = state.get("messages", [])
+    index = state.get("last_user_msg_index")
+    if index is None or not 0 <= index < len(messages):
+        index = find_last_user_message_index(messages)
+        if index is None:
+            return None
+    return messages[index].content
+
+
+def normalize_message(message: str) -> str:
+    """Lowercase and collapse whitespace, for cache keys where case and spacing don't matter."""
+    return " ".join(message.casefold().split())
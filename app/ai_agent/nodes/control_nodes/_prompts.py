@@ -0,0 +1,27 @@
+"""Prompt fragments shared by the control nodes."""
+
+from datetime import datetime, timedelta
+
+# English day names by weekday() (what strftime("%A") gives in the default C locale)
+_DAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+
+def format_date_context(today: datetime) -> str:
+    """
+    Build the CURRENT DATE AND TIME CONTEXT block for a planning prompt.
+
+    Formats today once with isoformat() and slices the date and time parts out of it,
+    instead of a separate strftime call per field.
+    """
+    today_datetime = today.isoformat(sep=" ", timespec="seconds")[:19]
+    today_str = today_datetime[:10]
+    today_time = today_datetime[11:]
+    today_day_name = _DAY_NAMES[today.weekday()]
+    tomorrow = today + timedelta(days=1)
+    tomorrow_str = tomorrow.date().isoformat()
+    tomorrow_day_name = _DAY_NAMES[tomorrow.weekday()]
+    return f"""CURRENT DATE AND TIME CONTEXT:
+- Current date and time: {today_datetime} ({today_day_name})
+- Today is {today_day_name}, {today_str}
+- Current time: {today_time}
+- Tomorrow is {tomorrow_day_name}, {tomorrow_str}"""
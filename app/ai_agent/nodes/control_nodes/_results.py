@@ -0,0 +1,48 @@
+"""State updates shared by the control nodes, and checks on the planner output behind them."""
+
+from typing import Any, Dict
+
+# Asked when the LLM call itself fails (network, API, timeout, etc.)
+LLM_ERROR_QUESTION = "I encountered an error processing your request. Could you please try again or rephrase your request?"
+
+PLAN_STATUSES = frozenset({"PLAN_READY", "NEEDS_CLARIFICATION", "PLAN_INFEASIBLE"})
+
+
+def needs_clarification(definition_key: str, question: str) -> Dict:
+    """
+    Build the NEEDS_CLARIFICATION update for a planning node.
+
+    definition_key is the node's output field (habit_definition, task_definition),
+    which is reset to empty. A fresh dict is built on every call so later nodes can
+    mutate the result without touching another run's state.
+    """
+    return {
+        "plan_status": "NEEDS_CLARIFICATION",
+        definition_key: {},
+        "explanation_payload": {"clarification_questions": [question]},
+    }
+
+
+def is_number(value: Any) -> bool:
+    """True for a JSON number (bools are ints in Python, so they are excluded explicitly)."""
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def has_valid_plan_shape(analysis: Any, definition_key: str, number_fields: tuple) -> bool:
+    """
+    Check a planner response that came without a schema (the combined intent call).
+
+    The response must be an object with a known plan_status and an object under
+    definition_key ("plan", "task") whose number_fields are numbers when present,
+    and clarification_questions must be a list of strings when present. Anything
+    else is rejected so the planner makes its own, schema-checked call instead.
+    """
+    if not isinstance(analysis, dict) or analysis.get("plan_status") not in PLAN_STATUSES:
+        return False
+    definition = analysis.get(definition_key)
+    if not isinstance(definition, dict):
+        return False
+    if any(key in definition and not is_number(definition[key]) for key in number_fields):
+        return False
+    questions = analysis.get("clarification_questions", [])
+    return isinstance(questions, list) and all(isinstance(question, str) for question in questions)
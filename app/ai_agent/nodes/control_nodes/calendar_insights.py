@@ -1,10 +1,21 @@
 """Calendar insights node - provides analysis and insights about the user's calendar."""
 
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import AIMessage
+from itertools import islice
+from typing import List
 
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from app.ai_agent.nodes.control_nodes._llm import get_chat_model
+from app.ai_agent.nodes.control_nodes._messages import get_last_user_message
 from app.ai_agent.state import AgentState
 
+# System prompt for insights generation
+# TODO: This prompt will be refined in more detail later
+_SYSTEM_PROMPT = """You are a helpful calendar assistant that provides insights and analysis about the user's calendar.
+You should analyze the calendar events and provide meaningful insights based on the user's query.
+Do NOT suggest modifying or creating calendar events - this is a read-only analysis.
+Be clear, concise, and helpful."""
+
 
 def calendar_insights(state: AgentState) -> AgentState:
     """
@@ -16,9 +27,18 @@ def calendar_insights(state: AgentState) -> AgentState:
     Reads: messages, calendar_events_raw (optional), calendar_events_normalized (optional)
     Writes: messages (append assistant insights)
     """
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
-    
-    messages = state.get("messages", [])
+    response = get_chat_model("gpt-4o-mini", 0.7).invoke(_build_insights_prompt(state))
+    return {"messages": [AIMessage(content=response.content)]}
+
+
+async def acalendar_insights(state: AgentState) -> AgentState:
+    """Async variant of calendar_insights; awaits the LLM call instead of blocking on it."""
+    response = await get_chat_model("gpt-4o-mini", 0.7).ainvoke(_build_insights_prompt(state))
+    return {"messages": [AIMessage(content=response.content)]}
+
+
+def _build_insights_prompt(state: AgentState) -> List[BaseMessage]:
+    """Build the [system, user] prompt for the insights LLM call."""
     calendar_events_raw = state.get("calendar_events_raw", [])
     calendar_events_normalized = state.get("calendar_events_normalized", [])
     insight_request = state.get("insight_request", {})
@@ -30,33 +50,22 @@ def calendar_insights(state: AgentState) -> AgentState:
     user_prompt = insight_request.get("user_prompt") if insight_request else None
     if not user_prompt:
         # Fallback to last user message
-        for msg in reversed(messages):
-            if hasattr(msg, 'content') and not hasattr(msg, 'tool_calls'):
-                user_prompt = msg.content
-                break
+        user_prompt = get_last_user_message(state)
     
     # Prepare calendar data summary for the LLM
-    events_summary = ""
     if events_to_analyze:
-        events_summary = f"Found {len(events_to_analyze)} calendar events to analyze."
+        summary_parts = [f"Found {len(events_to_analyze)} calendar events to analyze.", "", "Sample events:"]
         # Include a sample of events for context
-        sample_events = events_to_analyze[:10]  # First 10 events
-        events_summary += f"\n\nSample events:\n"
-        for i, event in enumerate(sample_events, 1):
-            summary = event.get("summary", "No title")
-            start = event.get("start", {})
-            end = event.get("end", {})
-            events_summary += f"{i}. {summary} ({start} - {end})\n"
+        sample_events = islice(events_to_analyze, 10)  # First 10 events, without copying the list
+        summary_parts.extend(
+            f"{i}. {event.get('summary', 'No title')} ({event.get('start', {})} - {event.get('end', {})})"
+            for i, event in enumerate(sample_events, 1)
+        )
+        summary_parts.append("")
+        events_summary = "\n".join(summary_parts)
     else:
         events_summary = "No calendar events found in the current state."
     
-    # Create prompt for insights generation
-    # TODO: This prompt will be refined in more detail later
-    system_prompt = """You are a helpful calendar assistant that provides insights and analysis about the user's calendar.
-You should analyze the calendar events and provide meaningful insights based on the user's query.
-Do NOT suggest modifying or creating calendar events - this is a read-only analysis.
-Be clear, concise, and helpful."""
-    
     user_query_context = f"User query: {user_prompt}" if user_prompt else "User wants calendar analysis."
     
     # Include insight request details if available
@@ -71,17 +80,13 @@ Be clear, concise, and helpful."""
         if focus_areas:
             analysis_context += f"\n- Focus areas: {', '.join(focus_areas)}"
     
-    prompt = f"""{system_prompt}
-
-{user_query_context}{analysis_context}
+    user_prompt_text = f"""{user_query_context}{analysis_context}
 
 Calendar data:
 {events_summary}
 
 Provide your insights and analysis:"""
     
-    response = llm.invoke(prompt)
-    insights_message = AIMessage(content=response.content)
-    
-    return {"messages": messages + [insights_message]}
+    return [SystemMessage(content=_SYSTEM_PROMPT), HumanMessage(content=user_prompt_text)]
+
 
@@ -1,10 +1,17 @@
 """Clarification agent node - asks user for clarification."""
 
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import AIMessage
+import os
 
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+
+from app.ai_agent.nodes.control_nodes._llm import get_chat_model
 from app.ai_agent.state import AgentState
 
+_SYSTEM_PROMPT = """You are a helpful assistant asking for clarification. Make your message friendly and conversational."""
+
+# Up to this many explicit questions are sent as formatted, without an LLM rewrite
+_MAX_TEMPLATED_QUESTIONS = 3
+
 
 def clarification_agent(state: AgentState) -> AgentState:
     """
@@ -13,9 +20,6 @@ def clarification_agent(state: AgentState) -> AgentState:
     Reads: clarification_questions (from explanation_payload)
     Writes: messages (append assistant clarification message)
     """
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
-    
-    messages = state.get("messages", [])
     explanation_payload = state.get("explanation_payload", {})
     clarification_questions = explanation_payload.get("clarification_questions", [])
     
@@ -30,11 +34,19 @@ def clarification_agent(state: AgentState) -> AgentState:
             questions_list = "\n".join(f"- {q}" for q in clarification_questions)
             clarification_text = f"I need some clarification:\n{questions_list}"
     
+    # A short explicit list is already a complete message; skip the LLM round trip
+    if clarification_questions and len(clarification_questions) <= _MAX_TEMPLATED_QUESTIONS and not _use_llm_clarification():
+        return {"messages": [AIMessage(content=clarification_text)]}
+    
     # Use LLM to make the clarification message more natural
-    system_prompt = """You are a helpful assistant asking for clarification. Make your message friendly and conversational."""
-    prompt = f"{system_prompt}\n\nQuestions to ask: {clarification_text}\n\nYour message:"
+    prompt = f"Questions to ask: {clarification_text}\n\nYour message:"
     
-    response = llm.invoke(prompt)
+    response = get_chat_model("gpt-4o-mini", 0.7).invoke([SystemMessage(content=_SYSTEM_PROMPT), HumanMessage(content=prompt)])
     clarification_message = AIMessage(content=response.content)
     
-    return {"messages": messages + [clarification_message]}
\ No newline at end of file
+    return {"messages": [clarification_message]}
+
+
+def _use_llm_clarification() -> bool:
+    """Whether explicit questions are rephrased by the LLM (USE_LLM_CLARIFICATION=true) instead of sent as formatted."""
+    return os.getenv("USE_LLM_CLARIFICATION", "false").strip().lower() == "true"
@@ -1,10 +1,42 @@
 """Execution decision node - decides whether to execute, dry-run, or cancel."""
 
-from langchain_openai import ChatOpenAI
 import json
+import logging
+from functools import lru_cache
+from typing import Optional
 
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from app.ai_agent.nodes.control_nodes._llm import get_chat_model
 from app.ai_agent.state import AgentState
 
+logger = logging.getLogger(__name__)
+
+# Fields that make a plan complete enough to execute without asking the LLM
+_REQUIRED_PLAN_FIELDS = {
+    "habit": ("habit_name", "frequency", "duration_minutes"),
+    "task": ("task_name", "estimated_time_minutes"),
+}
+
+_VALID_DECISIONS = ("EXECUTE", "DRY_RUN", "CANCEL")
+
+_SYSTEM_PROMPT = """You are an execution decision maker. Based on the plan, decide whether to:
+- EXECUTE: Proceed with creating calendar events
+- DRY_RUN: Show what would be scheduled without actually creating events
+- CANCEL: Do not proceed with scheduling"""
+
+# Structured output: the model can only answer with one of the valid decisions
+_DECISION_SCHEMA = {
+    "title": "ExecutionDecision",
+    "description": "Whether to execute, dry-run, or cancel the plan.",
+    "type": "object",
+    "properties": {
+        "decision": {"type": "string", "enum": list(_VALID_DECISIONS)},
+    },
+    "required": ["decision"],
+    "additionalProperties": False,
+}
+
 
 def execution_decider(state: AgentState) -> AgentState:
     """
@@ -13,23 +45,18 @@ def execution_decider(state: AgentState) -> AgentState:
     Reads: plan (from habit_definition or task_definition)
     Writes: execution_decision
     """
-    print("=" * 50)
-    print("Execution Decider: Starting execution decision")
-    print("=" * 50)
-    
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+    logger.debug("Execution Decider: Starting execution decision")
     
     habit_definition = state.get("habit_definition", {})
     task_definition = state.get("task_definition", {})
     plan_status = state.get("plan_status", "PLAN_INFEASIBLE")
     
-    print(f"Execution Decider: Plan status = {plan_status}")
-    print(f"Execution Decider: Has habit_definition = {bool(habit_definition)}")
-    print(f"Execution Decider: Has task_definition = {bool(task_definition)}")
+    logger.debug("Execution Decider: Plan status = %s", plan_status)
+    logger.debug("Execution Decider: Has habit_definition = %s", bool(habit_definition))
+    logger.debug("Execution Decider: Has task_definition = %s", bool(task_definition))
     
     if plan_status != "PLAN_READY":
-        print(f"Execution Decider: Plan status is not PLAN_READY, returning CANCEL")
-        print("=" * 50)
+        logger.debug("Execution Decider: Plan status is not PLAN_READY, returning CANCEL")
         return {"execution_decision": "CANCEL"}
     
     # Determine which definition to use (habit or task)
@@ -37,40 +64,55 @@ def execution_decider(state: AgentState) -> AgentState:
     plan_type = "habit" if habit_definition else "task"
     
     if not plan_definition:
-        print("Execution Decider: No plan definition found, returning CANCEL")
-        print("=" * 50)
+        logger.debug("Execution Decider: No plan definition found, returning CANCEL")
         return {"execution_decision": "CANCEL"}
     
-    print(f"Execution Decider: Using {plan_type} definition")
-    print(f"Execution Decider: Plan definition = {plan_definition}")
+    logger.debug("Execution Decider: Using %s definition", plan_type)
+    logger.debug("Execution Decider: Plan definition = %s", plan_definition)
     
-    # Create decision prompt
-    system_prompt = """You are an execution decision maker. Based on the plan, decide whether to:
-- EXECUTE: Proceed with creating calendar events
-- DRY_RUN: Show what would be scheduled without actually creating events
-- CANCEL: Do not proceed with scheduling
-
-Respond with ONLY one word: EXECUTE, DRY_RUN, or CANCEL"""
-    
-    plan_str = json.dumps(plan_definition, indent=2)
-    prompt = f"{system_prompt}\n\nPlan ({plan_type}):\n{plan_str}\n\nDecision:"
+    execution_decision = _decide_from_plan(plan_type, plan_definition)
+    if execution_decision is not None:
+        logger.debug("Execution Decider: Decided from plan fields, skipping LLM")
+    else:
+        plan_str = json.dumps(plan_definition)
+        execution_decision = _decide_with_llm(plan_type, plan_str)
     
-    print(f"Execution Decider: Invoking LLM for execution decision...")
-    response = llm.invoke(prompt)
-    decision_text = response.content.strip().upper()
+    logger.debug("Execution Decider: Final execution decision = %s", execution_decision)
     
-    print(f"Execution Decider: LLM response = {response.content}")
-    print(f"Execution Decider: Decision text = {decision_text}")
+    return {"execution_decision": execution_decision}
+
+
+def _decide_from_plan(plan_type: str, plan_definition: dict) -> Optional[str]:
+    """
+    Decide deterministically from the plan itself.
     
-    # Map response to valid decision
-    valid_decisions = ["EXECUTE", "DRY_RUN", "CANCEL"]
-    execution_decision = "CANCEL"
-    for valid_decision in valid_decisions:
-        if valid_decision in decision_text:
-            execution_decision = valid_decision
-            break
+    Returns DRY_RUN for plans flagged dry_run, EXECUTE for complete plans without
+    open clarification questions, and None when the LLM should decide.
+    """
+    if plan_definition.get("dry_run"):
+        return "DRY_RUN"
+    if plan_definition.get("clarification_questions"):
+        return None
+    required_fields = _REQUIRED_PLAN_FIELDS.get(plan_type, ())
+    if required_fields and all(plan_definition.get(field) for field in required_fields):
+        return "EXECUTE"
+    return None
+
+
+@lru_cache(maxsize=None)
+def _get_decision_llm():
+    """Get or create the structured-output decision model (temperature 0 for repeatable decisions)."""
+    return get_chat_model("gpt-4o-mini", 0.0).with_structured_output(_DECISION_SCHEMA, method="json_schema", strict=True)
+
+
+@lru_cache(maxsize=128)
+def _decide_with_llm(plan_type: str, plan_str: str) -> str:
+    """Ask the LLM for a decision; identical plans reuse the earlier answer."""
+    prompt = f"Plan ({plan_type}):\n{plan_str}"
     
-    print(f"Execution Decider: Final execution decision = {execution_decision}")
-    print("=" * 50)
+    logger.debug("Execution Decider: Invoking LLM for execution decision...")
+    result = _get_decision_llm().invoke([SystemMessage(content=_SYSTEM_PROMPT), HumanMessage(content=prompt)])
+    logger.debug("Execution Decider: LLM response = %s", result)
     
-    return {"execution_decision": execution_decision}
\ No newline at end of file
+    decision = result.get("decision") if isinstance(result, dict) else None
+    return decision if decision in _VALID_DECISIONS else "CANCEL"
@@ -1,10 +1,14 @@
 """Explanation agent node - provides explanations to the user."""
 
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import AIMessage
+from typing import List
 
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from app.ai_agent.nodes.control_nodes._llm import get_chat_model
 from app.ai_agent.state import AgentState
 
+_SYSTEM_PROMPT = """You are a helpful assistant explaining scheduling results to the user. Be clear and concise."""
+
 
 def explanation_agent(state: AgentState) -> AgentState:
     """
@@ -13,9 +17,18 @@ def explanation_agent(state: AgentState) -> AgentState:
     Reads: plan (from habit_definition) OR failure_reason
     Writes: messages (append assistant explanation)
     """
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
-    
-    messages = state.get("messages", [])
+    response = get_chat_model("gpt-4o-mini", 0.7).invoke(_build_explanation_prompt(state))
+    return {"messages": [AIMessage(content=response.content)]}
+
+
+async def aexplanation_agent(state: AgentState) -> AgentState:
+    """Async variant of explanation_agent; awaits the LLM call instead of blocking on it."""
+    response = await get_chat_model("gpt-4o-mini", 0.7).ainvoke(_build_explanation_prompt(state))
+    return {"messages": [AIMessage(content=response.content)]}
+
+
+def _build_explanation_prompt(state: AgentState) -> List[BaseMessage]:
+    """Build the [system, user] prompt for the explanation LLM call."""
     habit_definition = state.get("habit_definition", {})
     failure_reason = state.get("failure_reason")
     plan_status = state.get("plan_status", "PLAN_INFEASIBLE")
@@ -36,11 +49,6 @@ def explanation_agent(state: AgentState) -> AgentState:
     else:
         explanation_context = f"Plan status: {plan_status}"
     
-    # Generate explanation
-    system_prompt = """You are a helpful assistant explaining scheduling results to the user. Be clear and concise."""
-    prompt = f"{system_prompt}\n\nContext: {explanation_context}\n\nYour explanation:"
-    
-    response = llm.invoke(prompt)
-    explanation_message = AIMessage(content=response.content)
+    prompt = f"Context: {explanation_context}\n\nYour explanation:"
     
-    return {"messages": messages + [explanation_message]}
\ No newline at end of file
+    return [SystemMessage(content=_SYSTEM_PROMPT), HumanMessage(content=prompt)]
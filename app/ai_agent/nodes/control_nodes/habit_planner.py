@@ -1,148 +1,189 @@
 """Habit planning node - creates a plan for scheduling habits."""
 
-from langchain_openai import ChatOpenAI
 import json
-from datetime import datetime, timedelta
+import logging
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple, Union
 
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from app.ai_agent.nodes.control_nodes._llm import astream_until_status, get_json_chat_model, stream_until_status
+from app.ai_agent.nodes.control_nodes._messages import get_last_user_message
+from app.ai_agent.nodes.control_nodes._prompts import format_date_context
+from app.ai_agent.nodes.control_nodes._results import LLM_ERROR_QUESTION, has_valid_plan_shape, needs_clarification
 from app.ai_agent.state import AgentState
 
+logger = logging.getLogger(__name__)
+
+# Plan fields that later nodes do arithmetic on
+_PLAN_NUMBER_FIELDS = ("duration_minutes", "max_duration_minutes", "buffer_minutes", "num_occurrences")
+
+# Static planning instructions; the date context and user request go in the HumanMessage
+# so this prefix is identical on every call (and eligible for provider prompt caching)
+_SYSTEM_PROMPT = """You are a habit planning assistant. Analyze the user's request and create a structured plan.
+
+Use the current date and time context provided with the request to understand temporal references in the user's request (e.g., "starting today", "for 2 weeks", "every Monday").
+
+Respond with a JSON object containing (plan_status first):
+{
+    "plan_status": "PLAN_READY" | "NEEDS_CLARIFICATION" | "PLAN_INFEASIBLE",
+    "plan": {
+        "habit_name": "string",
+        "frequency": "daily/weekly/etc",
+        "duration_minutes": number,
+        "max_duration_minutes": number (optional, maximum duration for the habit session, default to 60 if not specified),
+        "buffer_minutes": number (optional, minimum gap between consecutive events for this habit, default to 15 if not specified),
+        "num_occurrences": number (optional, total number of events to schedule. For example: "2 weeks" with daily frequency = 14, "1 month" with weekly frequency = 4. If not specified, defaults based on frequency: daily=7, weekly=1, twice_weekly=2),
+        "description": "string"
+    },
+    "clarification_questions": ["question1", "question2"] (only if plan_status is NEEDS_CLARIFICATION)
+}
+
+If information is missing or unclear, set plan_status to NEEDS_CLARIFICATION and provide clarification_questions.
+If the request is impossible or contradictory, set plan_status to PLAN_INFEASIBLE.
+If max_duration_minutes is not specified by the user, set it to 60.
+If buffer_minutes is not specified by the user, set it to 15.
+Extract num_occurrences from user requests like "for 2 weeks", "for 1 month", "for 10 days", etc. If the user says "schedule daily for 2 weeks", set num_occurrences to 14 (2 weeks × 7 days)."""
+
 
 def habit_planner(state: AgentState) -> AgentState:
     """
     Create a plan for habit scheduling.
     
-    Reads: messages, intent_type
+    Reads: messages (via last_user_msg_index), intent_type
     Writes: plan (stored in habit_definition), plan_status, clarification_questions (stored in explanation_payload)
     """
-    print("=" * 50)
-    print("Habit Planner: Starting habit planning")
-    print("=" * 50)
+    result, prompt = _prepare_habit_planning(state)
+    if prompt is None:
+        return result
     
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.5)
+    logger.debug("Habit Planner: Invoking LLM for habit planning...")
+    try:
+        response_text, plan_status = stream_until_status(get_json_chat_model("gpt-4o-mini", 0.5).stream(prompt), "PLAN_INFEASIBLE")
+    except Exception as e:
+        # Handle LLM invocation errors (network, API, timeout, etc.)
+        logger.warning("Habit Planner: Error invoking LLM - %s: %s", type(e).__name__, e)
+        logger.debug("Habit Planner: Returning NEEDS_CLARIFICATION status due to LLM error")
+        return result
+    return _parse_habit_plan(response_text.strip(), plan_status)
+
+
+async def ahabit_planner(state: AgentState) -> AgentState:
+    """Async variant of habit_planner; awaits the LLM stream instead of blocking on it."""
+    result, prompt = _prepare_habit_planning(state)
+    if prompt is None:
+        return result
+    
+    logger.debug("Habit Planner: Invoking LLM for habit planning...")
+    try:
+        response_text, plan_status = await astream_until_status(get_json_chat_model("gpt-4o-mini", 0.5).astream(prompt), "PLAN_INFEASIBLE")
+    except Exception as e:
+        # Handle LLM invocation errors (network, API, timeout, etc.)
+        logger.warning("Habit Planner: Error invoking LLM - %s: %s", type(e).__name__, e)
+        logger.debug("Habit Planner: Returning NEEDS_CLARIFICATION status due to LLM error")
+        return result
+    return _parse_habit_plan(response_text.strip(), plan_status)
+
+
+def _prepare_habit_planning(state: AgentState) -> Tuple[Dict, Optional[List[BaseMessage]]]:
+    """
+    Resolve habit planning up to the LLM call.
+    
+    Returns (result, None) when no LLM call is needed (intent mismatch), or
+    (result to use if the LLM call fails, planning prompt).
+    """
+    logger.debug("Habit Planner: Starting habit planning")
     
-    messages = state.get("messages", [])
     intent_type = state.get("intent_type", "UNKNOWN")
     
-    print(f"Habit Planner: Intent type = {intent_type}")
+    logger.debug("Habit Planner: Intent type = %s", intent_type)
     
     if intent_type != "HABIT_SCHEDULE":
-        print(f"Habit Planner: Intent mismatch. Expected HABIT_SCHEDULE, got {intent_type}")
-        print("=" * 50)
+        logger.debug("Habit Planner: Intent mismatch. Expected HABIT_SCHEDULE, got %s", intent_type)
         return {
             "plan_status": "PLAN_INFEASIBLE",
             "habit_definition": {},
             "explanation_payload": {"reason": "Intent is not HABIT_SCHEDULE"}
-        }
+        }, None
+    
+    # Reuse the analysis produced in the same LLM call as the intent classification
+    # (that call has no response schema, so its shape is checked before use)
+    intent_analysis = state.get("intent_analysis")
+    if intent_analysis is not None:
+        if has_valid_plan_shape(intent_analysis, "plan", _PLAN_NUMBER_FIELDS):
+            logger.debug("Habit Planner: Using analysis from intent classification")
+            return _parse_habit_plan(intent_analysis), None
+        logger.warning("Habit Planner: Ignoring malformed analysis from intent classification: %s", intent_analysis)
     
     # Extract user message
-    user_message = ""
-    for msg in reversed(messages):
-        if hasattr(msg, 'content') and not hasattr(msg, 'tool_calls'):
-            user_message = msg.content
-            break
+    user_message = get_last_user_message(state) or ""
     
-    print(f"Habit Planner: User message = {user_message}")
+    logger.debug("Habit Planner: User message = %s", user_message)
     
     # Get current date and time for context
     today = datetime.now()
-    today_str = today.strftime("%Y-%m-%d")
-    today_day_name = today.strftime("%A")
-    today_time = today.strftime("%H:%M:%S")
-    today_datetime = today.strftime("%Y-%m-%d %H:%M:%S")
-    tomorrow = today + timedelta(days=1)
-    tomorrow_str = tomorrow.strftime("%Y-%m-%d")
-    tomorrow_day_name = tomorrow.strftime("%A")
+    date_context = format_date_context(today)
     
-    print(f"Habit Planner: Today is {today_day_name}, {today_str} at {today_time}")
-    print(f"Habit Planner: Tomorrow is {tomorrow_day_name}, {tomorrow_str}")
+    logger.debug("Habit Planner: %s", date_context)
     
     # Create planning prompt
-    system_prompt = f"""You are a habit planning assistant. Analyze the user's request and create a structured plan.
+    prompt = f"""{date_context}
 
-CURRENT DATE AND TIME CONTEXT:
-- Current date and time: {today_datetime} ({today_day_name})
-- Today is {today_day_name}, {today_str}
-- Current time: {today_time}
-- Tomorrow is {tomorrow_day_name}, {tomorrow_str}
+User request: {user_message}
 
-Use this date and time context to understand temporal references in the user's request (e.g., "starting today", "for 2 weeks", "every Monday").
+Response (JSON only):"""
+    
+    logger.debug("Habit Planner: Prompt created (length: %s characters)", len(_SYSTEM_PROMPT) + len(prompt))
+    
+    # Returned as-is if the LLM call fails
+    llm_error_result = needs_clarification("habit_definition", LLM_ERROR_QUESTION)
+    return llm_error_result, [SystemMessage(content=_SYSTEM_PROMPT), HumanMessage(content=prompt)]
 
-Respond with a JSON object containing:
-{{
-    "plan": {{
-        "habit_name": "string",
-        "frequency": "daily/weekly/etc",
-        "duration_minutes": number,
-        "max_duration_minutes": number (optional, maximum duration for the habit session, default to 60 if not specified),
-        "buffer_minutes": number (optional, minimum gap between consecutive events for this habit, default to 15 if not specified),
-        "num_occurrences": number (optional, total number of events to schedule. For example: "2 weeks" with daily frequency = 14, "1 month" with weekly frequency = 4. If not specified, defaults based on frequency: daily=7, weekly=1, twice_weekly=2),
-        "description": "string"
-    }},
-    "plan_status": "PLAN_READY" | "NEEDS_CLARIFICATION" | "PLAN_INFEASIBLE",
-    "clarification_questions": ["question1", "question2"] (only if plan_status is NEEDS_CLARIFICATION)
-}}
 
-If information is missing or unclear, set plan_status to NEEDS_CLARIFICATION and provide clarification_questions.
-If the request is impossible or contradictory, set plan_status to PLAN_INFEASIBLE.
-If max_duration_minutes is not specified by the user, set it to 60.
-If buffer_minutes is not specified by the user, set it to 15.
-Extract num_occurrences from user requests like "for 2 weeks", "for 1 month", "for 10 days", etc. If the user says "schedule daily for 2 weeks", set num_occurrences to 14 (2 weeks × 7 days)."""
-    
-    prompt = f"{system_prompt}\n\nUser request: {user_message}\n\nResponse (JSON only):"
+def _parse_habit_plan(response_text: Union[str, Dict], plan_status: Optional[str] = None) -> Dict:
+    """
+    Turn the LLM's JSON response into the habit_definition update, filling in defaults.
     
-    print(f"Habit Planner: Prompt created (length: {len(prompt)} characters)")
-    print("Habit Planner: Invoking LLM for habit planning...")
-    try:
-        response = llm.invoke(prompt)
-        response_text = response.content.strip()
-    except Exception as e:
-        # Handle LLM invocation errors (network, API, timeout, etc.)
-        print(f"Habit Planner: Error invoking LLM - {type(e).__name__}: {e}")
-        print("Habit Planner: Returning NEEDS_CLARIFICATION status due to LLM error")
-        print("=" * 50)
+    Also accepts the already-parsed object produced alongside the intent classification.
+    """
+    if plan_status == "PLAN_INFEASIBLE":
+        # The stream was cut off once the status came in; nothing after it is needed
+        logger.debug("Habit Planner: Plan infeasible, stopped reading the response early")
         return {
-            "plan_status": "NEEDS_CLARIFICATION",
+            "plan_status": "PLAN_INFEASIBLE",
             "habit_definition": {},
-            "explanation_payload": {
-                "clarification_questions": ["I encountered an error processing your request. Could you please try again or rephrase your request?"]
-            }
+            "explanation_payload": {"reason": "Plan judged infeasible (stream aborted early)"}
         }
     
-    print(f"Habit Planner: LLM response = {response_text}")
+    logger.debug("Habit Planner: LLM response = %s", response_text)
     
-    # Try to extract JSON from response
+    # JSON mode: the response is the JSON object itself
     try:
-        # Remove markdown code blocks if present
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
-        
-        plan_data = json.loads(response_text)
-        print(f"Habit Planner: Parsed plan data = {plan_data}")
+        plan_data = json.loads(response_text) if isinstance(response_text, str) else response_text
+        logger.debug("Habit Planner: Parsed plan data = %s", plan_data)
         
         plan = plan_data.get("plan", {})
         plan_status = plan_data.get("plan_status", "PLAN_INFEASIBLE")
         clarification_questions = plan_data.get("clarification_questions", [])
         
-        print(f"Habit Planner: Plan status = {plan_status}")
-        print(f"Habit Planner: Habit name = {plan.get('habit_name', 'N/A')}")
-        print(f"Habit Planner: Frequency = {plan.get('frequency', 'N/A')}")
-        print(f"Habit Planner: Duration (minutes) = {plan.get('duration_minutes', 'N/A')}")
+        logger.debug("Habit Planner: Plan status = %s", plan_status)
+        logger.debug("Habit Planner: Habit name = %s", plan.get('habit_name', 'N/A'))
+        logger.debug("Habit Planner: Frequency = %s", plan.get('frequency', 'N/A'))
+        logger.debug("Habit Planner: Duration (minutes) = %s", plan.get('duration_minutes', 'N/A'))
         
         # Set default max_duration_minutes to 60 if not provided
         if "max_duration_minutes" not in plan:
             plan["max_duration_minutes"] = 60
-            print("Habit Planner: max_duration_minutes not specified, set to default 60")
+            logger.debug("Habit Planner: max_duration_minutes not specified, set to default 60")
         else:
-            print(f"Habit Planner: max_duration_minutes = {plan.get('max_duration_minutes')}")
+            logger.debug("Habit Planner: max_duration_minutes = %s", plan.get('max_duration_minutes'))
         
         # Set default buffer_minutes to 15 if not provided
         if "buffer_minutes" not in plan:
             plan["buffer_minutes"] = 15
-            print("Habit Planner: buffer_minutes not specified, set to default 15")
+            logger.debug("Habit Planner: buffer_minutes not specified, set to default 15")
         else:
-            print(f"Habit Planner: buffer_minutes = {plan.get('buffer_minutes')}")
+            logger.debug("Habit Planner: buffer_minutes = %s", plan.get('buffer_minutes'))
         
         # Set default num_occurrences based on frequency if not provided
         if "num_occurrences" not in plan:
@@ -155,9 +196,9 @@ Extract num_occurrences from user requests like "for 2 weeks", "for 1 month", "f
                 plan["num_occurrences"] = 2  # Default to 2 occurrences
             else:
                 plan["num_occurrences"] = 1  # Default fallback
-            print(f"Habit Planner: num_occurrences not specified, set to default {plan['num_occurrences']} based on frequency '{frequency}'")
+            logger.debug("Habit Planner: num_occurrences not specified, set to default %s based on frequency '%s'", plan['num_occurrences'], frequency)
         else:
-            print(f"Habit Planner: num_occurrences = {plan.get('num_occurrences')}")
+            logger.debug("Habit Planner: num_occurrences = %s", plan.get('num_occurrences'))
         
         result = {
             "habit_definition": plan,  # Store plan in habit_definition
@@ -165,24 +206,19 @@ Extract num_occurrences from user requests like "for 2 weeks", "for 1 month", "f
         }
         
         if clarification_questions:
-            print(f"Habit Planner: Clarification questions = {clarification_questions}")
+            logger.debug("Habit Planner: Clarification questions = %s", clarification_questions)
             result["explanation_payload"] = {"clarification_questions": clarification_questions}
         
-        print(f"Habit Planner: Final habit definition = {plan}")
-        print("Habit Planner: Habit planning complete")
-        print("=" * 50)
+        logger.debug("Habit Planner: Final habit definition = %s", plan)
+        logger.debug("Habit Planner: Habit planning complete")
         
         return result
-    except (json.JSONDecodeError, KeyError) as e:
-        # If parsing fails, mark as needing clarification
-        print(f"Habit Planner: Error parsing JSON response - {type(e).__name__}: {e}")
-        print(f"Habit Planner: Raw response text = {response_text}")
-        print("Habit Planner: Returning NEEDS_CLARIFICATION status")
-        print("=" * 50)
-        return {
-            "plan_status": "NEEDS_CLARIFICATION",
-            "habit_definition": {},
-            "explanation_payload": {
-                "clarification_questions": ["Could you provide more details about the habit you'd like to schedule?"]
-            }
-        }
\ No newline at end of file
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        # If parsing fails (invalid JSON, or JSON of the wrong shape), mark as needing clarification
+        logger.warning("Habit Planner: Error parsing JSON response - %s: %s", type(e).__name__, e)
+        logger.debug("Habit Planner: Raw response text = %s", response_text)
+        logger.debug("Habit Planner: Returning NEEDS_CLARIFICATION status")
+        return needs_clarification(
+            "habit_definition",
+            "Could you provide more details about the habit you'd like to schedule?",
+        )
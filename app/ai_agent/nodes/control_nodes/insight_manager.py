@@ -1,11 +1,61 @@
 """Insight manager node - extracts and structures analysis request details from user input."""
 
-from langchain_openai import ChatOpenAI
 import json
+import logging
 from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple, Union
 
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from app.ai_agent.nodes.control_nodes._llm import get_json_chat_model
+from app.ai_agent.nodes.control_nodes._messages import get_last_user_message
+from app.ai_agent.nodes.control_nodes._prompts import format_date_context
 from app.ai_agent.state import AgentState
 
+logger = logging.getLogger(__name__)
+
+# Static instructions; the date context and user request go in the HumanMessage
+# so this prefix is identical on every call (and eligible for provider prompt caching)
+_SYSTEM_PROMPT = """You are an insight request analyzer. Extract structured information from the user's calendar analysis request.
+
+Use the current date and time context provided with the request to understand temporal references in the user's request (e.g., "this week", "next month", "last 7 days", "upcoming events").
+
+Respond with a JSON object containing:
+{
+    "insight_request": {
+        "user_prompt": "string (the original user query/prompt)",
+        "intent": "CALENDAR_ANALYSIS",
+        "analysis_type": "string (e.g., 'busy_periods', 'free_time', 'event_summary', 'schedule_overview', 'conflicts', 'general')",
+        "focus_areas": ["area1", "area2"] (optional, specific aspects to analyze like 'meetings', 'work hours', 'personal time'),
+        "time_window_description": "string (human-readable description of the time window, e.g., 'next 7 days', 'this month')"
+    },
+    "planning_horizon": {
+        "start_date": "ISO 8601 datetime string (UTC, e.g., '2024-01-15T10:30:00+00:00')",
+        "end_date": "ISO 8601 datetime string (UTC, e.g., '2024-02-14T10:30:00+00:00')"
+    }
+}
+
+For planning_horizon:
+- Extract time window from phrases like "this week", "next month", "last 7 days", "upcoming events", "today", "tomorrow"
+- If no time window is specified, default to next 30 days from today
+- start_date should be today (or the specified start) in UTC
+- end_date should be calculated based on the time window mentioned
+- Use ISO 8601 format with timezone (e.g., "2024-01-15T10:30:00+00:00")
+
+For analysis_type:
+- "busy_periods": User wants to know when they're busy
+- "free_time": User wants to know available/free time
+- "event_summary": User wants a summary of events
+- "schedule_overview": User wants an overview of their schedule
+- "conflicts": User wants to identify scheduling conflicts
+- "general": General calendar analysis or insights
+
+Examples:
+- "Show me my schedule this week" → analysis_type: "schedule_overview", time_window: this week
+- "When am I free next week?" → analysis_type: "free_time", time_window: next week
+- "What meetings do I have?" → analysis_type: "event_summary", focus_areas: ["meetings"]
+- "Analyze my calendar" → analysis_type: "general", time_window: default (30 days)"""
+
 
 def insight_manager(state: AgentState) -> AgentState:
     """
@@ -20,180 +70,150 @@ def insight_manager(state: AgentState) -> AgentState:
     Reads: messages, intent_type
     Writes: insight_request (structured analysis request), planning_horizon (time window)
     """
-    print("=" * 50)
-    print("Insight Manager: Starting insight request analysis")
-    print("=" * 50)
+    defaults, prompt = _prepare_insight_request(state)
+    if prompt is None:
+        return defaults
+    
+    logger.debug("Insight Manager: Invoking LLM for insight request analysis...")
+    try:
+        response = get_json_chat_model("gpt-4o-mini", 0.3).invoke(prompt)
+    except Exception as e:
+        # Handle LLM invocation errors
+        logger.warning("Insight Manager: Error invoking LLM - %s: %s", type(e).__name__, e)
+        logger.debug("Insight Manager: Using defaults")
+        return defaults
+    return _parse_insight_request(response.content.strip(), defaults)
+
+
+async def ainsight_manager(state: AgentState) -> AgentState:
+    """Async variant of insight_manager; awaits the LLM call instead of blocking on it."""
+    defaults, prompt = _prepare_insight_request(state)
+    if prompt is None:
+        return defaults
+    
+    logger.debug("Insight Manager: Invoking LLM for insight request analysis...")
+    try:
+        response = await get_json_chat_model("gpt-4o-mini", 0.3).ainvoke(prompt)
+    except Exception as e:
+        # Handle LLM invocation errors
+        logger.warning("Insight Manager: Error invoking LLM - %s: %s", type(e).__name__, e)
+        logger.debug("Insight Manager: Using defaults")
+        return defaults
+    return _parse_insight_request(response.content.strip(), defaults)
+
+
+def _prepare_insight_request(state: AgentState) -> Tuple[Dict, Optional[List[BaseMessage]]]:
+    """
+    Resolve the insight request up to the LLM call.
     
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+    Returns (result, None) when no LLM call is needed (intent mismatch), or
+    (default insight_request/planning_horizon for this message, extraction prompt).
+    """
+    logger.debug("Insight Manager: Starting insight request analysis")
     
-    messages = state.get("messages", [])
     intent_type = state.get("intent_type", "UNKNOWN")
     
-    print(f"Insight Manager: Intent type = {intent_type}")
+    logger.debug("Insight Manager: Intent type = %s", intent_type)
     
     if intent_type != "CALENDAR_ANALYSIS":
-        print(f"Insight Manager: Intent mismatch. Expected CALENDAR_ANALYSIS, got {intent_type}")
-        print("=" * 50)
+        logger.debug("Insight Manager: Intent mismatch. Expected CALENDAR_ANALYSIS, got %s", intent_type)
         return {
             "insight_request": {},
             "planning_horizon": {}
-        }
+        }, None
     
     # Extract user message
-    user_message = ""
-    for msg in reversed(messages):
-        if hasattr(msg, 'content') and not hasattr(msg, 'tool_calls'):
-            user_message = msg.content
-            break
+    user_message = get_last_user_message(state) or ""
     
-    print(f"Insight Manager: User message = {user_message}")
+    logger.debug("Insight Manager: User message = %s", user_message)
     
     # Get current date and time for context
     today = datetime.now(timezone.utc)
-    today_str = today.strftime("%Y-%m-%d")
-    today_day_name = today.strftime("%A")
-    today_time = today.strftime("%H:%M:%S")
-    today_datetime = today.strftime("%Y-%m-%d %H:%M:%S")
-    tomorrow = today + timedelta(days=1)
-    tomorrow_str = tomorrow.strftime("%Y-%m-%d")
-    tomorrow_day_name = tomorrow.strftime("%A")
+    date_context = format_date_context(today)
     
-    print(f"Insight Manager: Today is {today_day_name}, {today_str} at {today_time}")
-    print(f"Insight Manager: Tomorrow is {tomorrow_day_name}, {tomorrow_str}")
+    logger.debug("Insight Manager: %s", date_context)
     
     # Create prompt for extracting insight request details
-    system_prompt = f"""You are an insight request analyzer. Extract structured information from the user's calendar analysis request.
+    prompt = f"""{date_context}
 
-CURRENT DATE AND TIME CONTEXT:
-- Current date and time: {today_datetime} ({today_day_name})
-- Today is {today_day_name}, {today_str}
-- Current time: {today_time}
-- Tomorrow is {tomorrow_day_name}, {tomorrow_str}
+User request: {user_message}
 
-Use this date and time context to understand temporal references in the user's request (e.g., "this week", "next month", "last 7 days", "upcoming events").
+Response (JSON only):"""
+    
+    # Default to next 30 days; used as-is if the LLM call or parsing fails
+    default_end = today + timedelta(days=30)
+    defaults = {
+        "insight_request": {
+            "user_prompt": user_message,
+            "intent": "CALENDAR_ANALYSIS",
+            "analysis_type": "general",
+            "time_window_description": "next 30 days"
+        },
+        "planning_horizon": {
+            "start_date": today.isoformat(),
+            "end_date": default_end.isoformat()
+        }
+    }
+    
+    # Reuse the analysis produced in the same LLM call as the intent classification
+    # (that call has no response schema, so its shape is checked before use)
+    intent_analysis = state.get("intent_analysis")
+    if intent_analysis is not None:
+        if _has_valid_shape(intent_analysis):
+            logger.debug("Insight Manager: Using analysis from intent classification")
+            return _parse_insight_request(intent_analysis, defaults), None
+        logger.warning("Insight Manager: Ignoring malformed analysis from intent classification: %s", intent_analysis)
+    return defaults, [SystemMessage(content=_SYSTEM_PROMPT), HumanMessage(content=prompt)]
 
-Respond with a JSON object containing:
-{{
-    "insight_request": {{
-        "user_prompt": "string (the original user query/prompt)",
-        "intent": "CALENDAR_ANALYSIS",
-        "analysis_type": "string (e.g., 'busy_periods', 'free_time', 'event_summary', 'schedule_overview', 'conflicts', 'general')",
-        "focus_areas": ["area1", "area2"] (optional, specific aspects to analyze like 'meetings', 'work hours', 'personal time'),
-        "time_window_description": "string (human-readable description of the time window, e.g., 'next 7 days', 'this month')"
-    }},
-    "planning_horizon": {{
-        "start_date": "ISO 8601 datetime string (UTC, e.g., '{today.isoformat()}')",
-        "end_date": "ISO 8601 datetime string (UTC, e.g., '{(today + timedelta(days=30)).isoformat()}')"
-    }}
-}}
 
-For planning_horizon:
-- Extract time window from phrases like "this week", "next month", "last 7 days", "upcoming events", "today", "tomorrow"
-- If no time window is specified, default to next 30 days from today
-- start_date should be today (or the specified start) in UTC
-- end_date should be calculated based on the time window mentioned
-- Use ISO 8601 format with timezone (e.g., "2024-01-15T10:30:00+00:00")
+def _has_valid_shape(analysis) -> bool:
+    """Check that insight_request and planning_horizon are objects, with string dates when present."""
+    if not isinstance(analysis, dict):
+        return False
+    insight_request = analysis.get("insight_request", {})
+    planning_horizon = analysis.get("planning_horizon", {})
+    if not isinstance(insight_request, dict) or not isinstance(planning_horizon, dict):
+        return False
+    return all(isinstance(planning_horizon.get(key) or "", str) for key in ("start_date", "end_date"))
 
-For analysis_type:
-- "busy_periods": User wants to know when they're busy
-- "free_time": User wants to know available/free time
-- "event_summary": User wants a summary of events
-- "schedule_overview": User wants an overview of their schedule
-- "conflicts": User wants to identify scheduling conflicts
-- "general": General calendar analysis or insights
 
-Examples:
-- "Show me my schedule this week" → analysis_type: "schedule_overview", time_window: this week
-- "When am I free next week?" → analysis_type: "free_time", time_window: next week
-- "What meetings do I have?" → analysis_type: "event_summary", focus_areas: ["meetings"]
-- "Analyze my calendar" → analysis_type: "general", time_window: default (30 days)"""
-    
-    prompt = f"{system_prompt}\n\nUser request: {user_message}\n\nResponse (JSON only):"
-    
-    print("Insight Manager: Invoking LLM for insight request analysis...")
-    try:
-        response = llm.invoke(prompt)
-        response_text = response.content.strip()
-    except Exception as e:
-        # Handle LLM invocation errors
-        print(f"Insight Manager: Error invoking LLM - {type(e).__name__}: {e}")
-        print("Insight Manager: Using defaults")
-        print("=" * 50)
-        # Default to next 30 days
-        default_end = today + timedelta(days=30)
-        return {
-            "insight_request": {
-                "user_prompt": user_message,
-                "intent": "CALENDAR_ANALYSIS",
-                "analysis_type": "general",
-                "time_window_description": "next 30 days"
-            },
-            "planning_horizon": {
-                "start_date": today.isoformat(),
-                "end_date": default_end.isoformat()
-            }
-        }
+def _parse_insight_request(response_text: Union[str, Dict], defaults: Dict) -> Dict:
+    """
+    Turn the LLM's JSON response into insight_request/planning_horizon, filling gaps from defaults.
     
-    print(f"Insight Manager: LLM response = {response_text}")
+    Also accepts the already-parsed object produced alongside the intent classification.
+    """
+    logger.debug("Insight Manager: LLM response = %s", response_text)
     
-    # Try to extract JSON from response
+    # JSON mode: the response is the JSON object itself
     try:
-        # Remove markdown code blocks if present
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
-        
-        data = json.loads(response_text)
-        print(f"Insight Manager: Parsed data = {data}")
+        data = json.loads(response_text) if isinstance(response_text, str) else response_text
+        logger.debug("Insight Manager: Parsed data = %s", data)
         
         insight_request = data.get("insight_request", {})
         planning_horizon = data.get("planning_horizon", {})
         
         # Validate and set defaults
-        if not insight_request.get("user_prompt"):
-            insight_request["user_prompt"] = user_message
-        
-        if not insight_request.get("intent"):
-            insight_request["intent"] = "CALENDAR_ANALYSIS"
-        
-        if not insight_request.get("analysis_type"):
-            insight_request["analysis_type"] = "general"
+        for key in ("user_prompt", "intent", "analysis_type"):
+            if not insight_request.get(key):
+                insight_request[key] = defaults["insight_request"][key]
         
         # Ensure planning_horizon has valid dates
-        if not planning_horizon.get("start_date"):
-            planning_horizon["start_date"] = today.isoformat()
-        
-        if not planning_horizon.get("end_date"):
-            default_end = today + timedelta(days=30)
-            planning_horizon["end_date"] = default_end.isoformat()
+        for key in ("start_date", "end_date"):
+            if not planning_horizon.get(key):
+                planning_horizon[key] = defaults["planning_horizon"][key]
         
-        print(f"Insight Manager: Insight request = {insight_request}")
-        print(f"Insight Manager: Planning horizon = {planning_horizon}")
-        print("Insight Manager: Insight request analysis complete")
-        print("=" * 50)
+        logger.debug("Insight Manager: Insight request = %s", insight_request)
+        logger.debug("Insight Manager: Planning horizon = %s", planning_horizon)
+        logger.debug("Insight Manager: Insight request analysis complete")
         
         return {
             "insight_request": insight_request,
             "planning_horizon": planning_horizon
         }
-    except (json.JSONDecodeError, KeyError) as e:
-        # If parsing fails, use defaults
-        print(f"Insight Manager: Error parsing JSON response - {type(e).__name__}: {e}")
-        print(f"Insight Manager: Raw response text = {response_text}")
-        print("Insight Manager: Using defaults")
-        print("=" * 50)
-        default_end = today + timedelta(days=30)
-        return {
-            "insight_request": {
-                "user_prompt": user_message,
-                "intent": "CALENDAR_ANALYSIS",
-                "analysis_type": "general",
-                "time_window_description": "next 30 days"
-            },
-            "planning_horizon": {
-                "start_date": today.isoformat(),
-                "end_date": default_end.isoformat()
-            }
-        }
-
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        # If parsing fails (invalid JSON, or JSON of the wrong shape), use defaults
+        logger.warning("Insight Manager: Error parsing JSON response - %s: %s", type(e).__name__, e)
+        logger.debug("Insight Manager: Raw response text = %s", response_text)
+        logger.debug("Insight Manager: Using defaults")
+        return defaults
@@ -1,57 +1,193 @@
 """Intent classification node - determines user intent from messages."""
 
-from langchain_openai import ChatOpenAI
-from langchain_core.messages import AIMessage
+import json
+import logging
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
 
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage
+
+from app.ai_agent.nodes.control_nodes._llm import get_json_chat_model
+from app.ai_agent.nodes.control_nodes._messages import find_last_user_message_index, normalize_message
+from app.ai_agent.nodes.control_nodes._prompts import format_date_context
 from app.ai_agent.state import AgentState
 
+logger = logging.getLogger(__name__)
+
+_VALID_INTENTS = frozenset({"HABIT_SCHEDULE", "TASK_SCHEDULE", "CALENDAR_ANALYSIS", "UNKNOWN"})
+
+# Normalized user message -> intent, shared by the sync and async paths (LRU by insertion order)
+_INTENT_CACHE_SIZE = 4096
+_intent_cache: Dict[str, str] = {}
+# The API server is threaded; the LRU's pop/re-insert and eviction must not interleave
+_intent_cache_lock = threading.Lock()
+
+# Choosing a label and filling in a short schema doesn't need a larger model; the
+# smallest one answers fastest. Planners check the analysis and redo it if it's unusable.
+_INTENT_MODEL = "gpt-4.1-nano"
+
+# Classification and planning in one request: the model picks the intent and fills in a
+# compact version of the matching planner's output, so the planner doesn't need a second
+# LLM round-trip. Only the output shapes are listed (not the planners' full instructions),
+# so UNKNOWN and small-talk turns stay cheap.
+_SYSTEM_PROMPT = """You classify the user's intent and analyze their request in a single step.
+
+Intents:
+- HABIT_SCHEDULE: User wants to schedule a recurring habit or routine
+- TASK_SCHEDULE: User wants to schedule a one-time task or event
+- CALENDAR_ANALYSIS: User wants to analyze or view their calendar
+- UNKNOWN: Intent is unclear or doesn't fit the above categories
+
+Respond with a JSON object: {"intent": "<intent>", "analysis": <object for that intent, null for UNKNOWN>}
+
+Use the date context given with the request for relative dates. plan_status is "PLAN_READY", "NEEDS_CLARIFICATION" (then include clarification_questions) or "PLAN_INFEASIBLE". All durations are integer minutes.
+
+HABIT_SCHEDULE analysis:
+{"plan_status": "...", "plan": {"habit_name": "string", "frequency": "daily" | "weekly" | "twice_weekly", "duration_minutes": number, "max_duration_minutes": number (default 60), "buffer_minutes": number (gap between events, default 15), "num_occurrences": number (e.g. daily for 2 weeks = 14; default daily=7, weekly=1, twice_weekly=2), "description": "string"}, "clarification_questions": ["string"]}
+
+TASK_SCHEDULE analysis (do not extract when it should happen):
+{"plan_status": "...", "task": {"task_name": "string (2-5 words)", "estimated_time_minutes": number (estimate from the task type if not given), "description": "string or empty"}, "clarification_questions": ["string"]}
+
+CALENDAR_ANALYSIS analysis:
+{"insight_request": {"user_prompt": "string", "intent": "CALENDAR_ANALYSIS", "analysis_type": "busy_periods" | "free_time" | "event_summary" | "schedule_overview" | "conflicts" | "general", "focus_areas": ["string"], "time_window_description": "string"}, "planning_horizon": {"start_date": "ISO 8601 UTC", "end_date": "ISO 8601 UTC (default 30 days from now)"}}"""
+
 
 def intent_classifier(state: AgentState) -> AgentState:
     """
     Classify user intent into one of: HABIT_SCHEDULE, TASK_SCHEDULE, CALENDAR_ANALYSIS, UNKNOWN.
     
-    Reads: messages
-    Writes: intent_type
+    When the LLM is called, it also returns the matching planner's output, which the
+    planner then reuses instead of making its own call.
+    
+    Reads: messages, intent_type
+    Writes: intent_type, last_user_msg_index, intent_analysis, calendar_events_prefetched (reset)
+    """
+    result, user_message = _prepare_classification(state)
+    if user_message is None:
+        return result
+    
+    # Normalize case and whitespace so trivially different retries share a cache entry
+    cache_key = normalize_message(user_message)
+    intent_type = _cached_intent(cache_key)
+    if intent_type is None:
+        response = get_json_chat_model(_INTENT_MODEL, 0.0).invoke(_build_analysis_prompt(user_message))
+        intent_type, result["intent_analysis"] = _parse_analysis(cache_key, response.content)
+    
+    logger.debug("Intent type: %s", intent_type)
+    
+    result["intent_type"] = intent_type
+    return result
+
+
+async def aintent_classifier(state: AgentState) -> AgentState:
+    """Async variant of intent_classifier; awaits the LLM call instead of blocking on it."""
+    result, user_message = _prepare_classification(state)
+    if user_message is None:
+        return result
+    
+    cache_key = normalize_message(user_message)
+    intent_type = _cached_intent(cache_key)
+    if intent_type is None:
+        response = await get_json_chat_model(_INTENT_MODEL, 0.0).ainvoke(_build_analysis_prompt(user_message))
+        intent_type, result["intent_analysis"] = _parse_analysis(cache_key, response.content)
+    
+    logger.debug("Intent type: %s", intent_type)
+    
+    result["intent_type"] = intent_type
+    return result
+
+
+def _prepare_classification(state: AgentState) -> Tuple[Dict, Optional[str]]:
     """
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+    Resolve everything up to the LLM call.
     
+    Returns (final result, None) when no classification is needed, or
+    (partial result, user message to classify).
+    """
+    # Record where the user's message sits so downstream nodes don't rescan the conversation
     messages = state.get("messages", [])
-    if not messages:
-        return {"intent_type": "UNKNOWN"}
+    last_user_msg_index = find_last_user_message_index(messages)
     
-    # Get the last user message
-    last_user_message = None
-    for msg in reversed(messages):
-        if hasattr(msg, 'content') and not hasattr(msg, 'tool_calls'):
-            last_user_message = msg.content
-            break
+    # Always written, so an analysis or prefetch flag from an earlier run is never reused
+    # (a run that ended in clarification or explanation leaves the prefetch flag set)
+    result = {"last_user_msg_index": last_user_msg_index, "intent_analysis": None, "calendar_events_prefetched": False}
     
-    if not last_user_message:
-        return {"intent_type": "UNKNOWN"}
+    # Respect an intent pre-set by the caller and skip the LLM round-trip
+    preset_intent = state.get("intent_type")
+    if preset_intent in _VALID_INTENTS:
+        logger.debug("Intent type (pre-set): %s", preset_intent)
+        result["intent_type"] = preset_intent
+        return result, None
     
-    # Create prompt for intent classification
-    system_prompt = """You are an intent classifier. Classify the user's intent into one of these categories:
-- HABIT_SCHEDULE: User wants to schedule a recurring habit or routine
-- TASK_SCHEDULE: User wants to schedule a one-time task or event
-- CALENDAR_ANALYSIS: User wants to analyze or view their calendar
-- UNKNOWN: Intent is unclear or doesn't fit the above categories
+    if last_user_msg_index is None or not messages[last_user_msg_index].content:
+        result["intent_type"] = "UNKNOWN"
+        return result, None
+    
+    return result, messages[last_user_msg_index].content
+
+
+def _cached_intent(user_message: str) -> Optional[str]:
+    """Return the cached intent for a normalized message, marking it most recently used."""
+    with _intent_cache_lock:
+        intent_type = _intent_cache.pop(user_message, None)
+        if intent_type is not None:
+            _intent_cache[user_message] = intent_type
+    return intent_type
 
-Respond with ONLY the intent type, nothing else."""
+
+def _build_analysis_prompt(user_message: str) -> List[BaseMessage]:
+    """Build the [system, user] prompt for classifying and analyzing a user message."""
+    prompt = f"""{format_date_context(datetime.now())}
+
+User request: {user_message}
+
+Response (JSON only):"""
+    return [SystemMessage(content=_SYSTEM_PROMPT), HumanMessage(content=prompt)]
+
+
+def _parse_analysis(cache_key: str, response_text: str) -> Tuple[str, Optional[Dict]]:
+    """
+    Split the JSON response into the intent type and the planner analysis for it.
     
-    prompt = f"{system_prompt}\n\nUser message: {last_user_message}\n\nIntent:"
+    The analysis is None when it is missing or unusable; the planner then makes its own call.
+    """
+    try:
+        data = json.loads(response_text)
+    except json.JSONDecodeError as e:
+        logger.warning("Intent classifier: Error parsing JSON response - %s: %s", type(e).__name__, e)
+        # Still recover the label if the response names one
+        return _parse_intent(cache_key, response_text), None
+    
+    intent_type = _parse_intent(cache_key, str(data.get("intent") or ""))
+    analysis = data.get("analysis")
+    if intent_type == "UNKNOWN" or not isinstance(analysis, dict):
+        analysis = None
+    return intent_type, analysis
+
+
+def _parse_intent(user_message: str, response_text: str) -> str:
+    """
+    Map the LLM response to a valid intent type and cache it for the message.
     
-    response = llm.invoke(prompt)
-    intent_text = response.content.strip().upper()
+    Failed LLM calls raise before reaching here and are not cached.
+    """
+    intent_text = response_text.strip().strip(".`'\"").upper()
     
-    # Map response to valid intent type
-    valid_intents = ["HABIT_SCHEDULE", "TASK_SCHEDULE", "CALENDAR_ANALYSIS", "UNKNOWN"]
-    intent_type = "UNKNOWN"
-    for valid_intent in valid_intents:
-        if valid_intent in intent_text:
-            intent_type = valid_intent
-            break
+    # Map response to valid intent type: an exact label, otherwise the label the
+    # response mentions first (not whichever label happens to be checked first)
+    if intent_text in _VALID_INTENTS:
+        intent_type = intent_text
+    else:
+        positions = {intent: intent_text.find(intent) for intent in _VALID_INTENTS}
+        mentioned = [intent for intent, position in positions.items() if position >= 0]
+        intent_type = min(mentioned, key=positions.__getitem__) if mentioned else "UNKNOWN"
     
-    print(f"Intent classifier response: {response.content}")
-    print(f"Intent type: {intent_type}")
+    logger.debug("Intent classifier response: %s", response_text)
     
-    return {"intent_type": intent_type}
\ No newline at end of file
+    with _intent_cache_lock:
+        if len(_intent_cache) >= _INTENT_CACHE_SIZE:
+            # Evict the least recently used entry (first in insertion order)
+            _intent_cache.pop(next(iter(_intent_cache)), None)
+        _intent_cache[user_message] = intent_type
+    return intent_type
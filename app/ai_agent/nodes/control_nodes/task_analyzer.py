@@ -1,81 +1,67 @@
 """Task analyzer node - extracts minimal task information from user request."""
 
-from langchain_openai import ChatOpenAI
 import json
-from datetime import datetime, timedelta
+import logging
+import threading
+from datetime import datetime
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple, Union
 
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from app.ai_agent.nodes.control_nodes._llm import astream_until_status, get_chat_model, stream_until_status
+from app.ai_agent.nodes.control_nodes._messages import get_last_user_message, normalize_message
+from app.ai_agent.nodes.control_nodes._prompts import format_date_context
+from app.ai_agent.nodes.control_nodes._results import LLM_ERROR_QUESTION, has_valid_plan_shape, needs_clarification
 from app.ai_agent.state import AgentState
 
+logger = logging.getLogger(__name__)
 
-def task_analyzer(state: AgentState) -> AgentState:
-    """
-    Analyze task request to extract minimal task information.
-    
-    Reads: messages, intent_type
-    Writes: task_definition (with task_name, estimated_time_minutes, description), plan_status
-    """
-    print("=" * 50)
-    print("Task Analyzer: Starting task analysis")
-    print("=" * 50)
-    
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.5)
-    
-    messages = state.get("messages", [])
-    intent_type = state.get("intent_type", "UNKNOWN")
-    
-    print(f"Task Analyzer: Intent type = {intent_type}")
-    
-    if intent_type != "TASK_SCHEDULE":
-        print(f"Task Analyzer: Intent mismatch. Expected TASK_SCHEDULE, got {intent_type}")
-        return {
-            "plan_status": "PLAN_INFEASIBLE",
-            "task_definition": {},
-            "explanation_payload": {"reason": "Intent is not TASK_SCHEDULE"}
-        }
-    
-    # Extract user message
-    user_message = ""
-    for msg in reversed(messages):
-        if hasattr(msg, 'content') and not hasattr(msg, 'tool_calls'):
-            user_message = msg.content
-            break
-    
-    print(f"Task Analyzer: User message = {user_message}")
-    
-    # Get current date and time for context
-    today = datetime.now()
-    today_str = today.strftime("%Y-%m-%d")
-    today_day_name = today.strftime("%A")
-    today_time = today.strftime("%H:%M:%S")
-    today_datetime = today.strftime("%Y-%m-%d %H:%M:%S")
-    tomorrow = today + timedelta(days=1)
-    tomorrow_str = tomorrow.strftime("%Y-%m-%d")
-    tomorrow_day_name = tomorrow.strftime("%A")
-    
-    print(f"Task Analyzer: Today is {today_day_name}, {today_str} at {today_time}")
-    print(f"Task Analyzer: Tomorrow is {tomorrow_day_name}, {tomorrow_str}")
-    
-    # Create simplified task analysis prompt - only extract essentials
-    system_prompt = f"""You are a task analysis assistant. Analyze the user's task request and extract only the essential information needed for scheduling.
+# Structured output: the response always has this shape (keys in this order, so
+# plan_status streams first and an infeasible plan can be cut off early)
+_TASK_ANALYSIS_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "plan_status": {"type": "string", "enum": ["PLAN_READY", "NEEDS_CLARIFICATION", "PLAN_INFEASIBLE"]},
+        "task": {
+            "type": "object",
+            "properties": {
+                "task_name": {"type": "string"},
+                "estimated_time_minutes": {"type": "integer"},
+                "description": {"type": "string"},
+            },
+            "required": ["task_name", "estimated_time_minutes", "description"],
+            "additionalProperties": False,
+        },
+        "clarification_questions": {"type": "array", "items": {"type": "string"}},
+    },
+    "required": ["plan_status", "task", "clarification_questions"],
+    "additionalProperties": False,
+}
+
+# Normalized user message -> PLAN_READY analysis (LRU by insertion order). The task
+# fields don't depend on the date context (scheduling preferences are read from the
+# message later, in select_slots), so a repeated request can reuse the analysis.
+_ANALYSIS_CACHE_SIZE = 1024
+_analysis_cache: Dict[str, Dict] = {}
+_analysis_cache_lock = threading.Lock()
 
-CURRENT DATE AND TIME CONTEXT:
-- Current date and time: {today_datetime} ({today_day_name})
-- Today is {today_day_name}, {today_str}
-- Current time: {today_time}
-- Tomorrow is {tomorrow_day_name}, {tomorrow_str}
+# Static instructions; the date context and user request go in the HumanMessage
+# so this prefix is identical on every call (and eligible for provider prompt caching)
+_SYSTEM_PROMPT = """You are a task analysis assistant. Analyze the user's task request and extract only the essential information needed for scheduling.
 
-Use this date and time context to understand temporal references in the user's request (e.g., "tonight" means today's evening, "tomorrow" means {tomorrow_str}, "in 2 hours" means approximately {today_time} + 2 hours).
+Use the current date and time context provided with the request to understand temporal references in the user's request (e.g., "tonight" means today's evening, "tomorrow" means the date given for tomorrow, "in 2 hours" means approximately the current time + 2 hours).
 
-Respond with a JSON object containing:
-{{
-    "task": {{
+Respond with a JSON object containing (plan_status first):
+{
+    "plan_status": "PLAN_READY" | "NEEDS_CLARIFICATION" | "PLAN_INFEASIBLE",
+    "task": {
         "task_name": "string (brief description of the task, e.g., 'Dinner', 'Team meeting', 'Review documents')",
         "estimated_time_minutes": number (estimated time required to complete the task in minutes),
         "description": "string (optional - detailed description if helpful, otherwise can be empty string)"
-    }},
-    "plan_status": "PLAN_READY" | "NEEDS_CLARIFICATION" | "PLAN_INFEASIBLE",
+    },
     "clarification_questions": ["question1", "question2"] (only if plan_status is NEEDS_CLARIFICATION)
-}}
+}
 
 For estimated_time_minutes:
 - Extract time estimates from phrases like "30 minutes", "1 hour", "2 hours", "half an hour", "1hr", etc.
@@ -100,57 +86,178 @@ If information is missing or unclear (especially estimated_time_minutes), set pl
 If the request is impossible or contradictory, set plan_status to PLAN_INFEASIBLE.
 
 IMPORTANT: Do NOT extract scheduling preferences (when, what time, which days) - those will be understood directly from the user's original message during slot selection."""
+
+
+def task_analyzer(state: AgentState) -> AgentState:
+    """
+    Analyze task request to extract minimal task information.
     
-    prompt = f"{system_prompt}\n\nUser request: {user_message}\n\nResponse (JSON only):"
+    Reads: messages, intent_type
+    Writes: task_definition (with task_name, estimated_time_minutes, description), plan_status
+    """
+    result, prompt = _prepare_task_analysis(state)
+    if prompt is None:
+        return result
     
-    print("Task Analyzer: Invoking LLM for task analysis...")
+    logger.debug("Task Analyzer: Invoking LLM for task analysis...")
     try:
-        response = llm.invoke(prompt)
-        response_text = response.content.strip()
+        response_text, plan_status = stream_until_status(_get_analysis_llm().stream(prompt), "PLAN_INFEASIBLE")
     except Exception as e:
         # Handle LLM invocation errors (network, API, timeout, etc.)
-        print(f"Task Analyzer: Error invoking LLM - {type(e).__name__}: {e}")
-        print("Task Analyzer: Returning NEEDS_CLARIFICATION status due to LLM error")
-        print("=" * 50)
+        logger.warning("Task Analyzer: Error invoking LLM - %s: %s", type(e).__name__, e)
+        logger.debug("Task Analyzer: Returning NEEDS_CLARIFICATION status due to LLM error")
+        return result
+    return _remember_analysis(state, _parse_task_analysis(response_text.strip(), plan_status))
+
+
+async def atask_analyzer(state: AgentState) -> AgentState:
+    """Async variant of task_analyzer; awaits the LLM stream instead of blocking on it."""
+    result, prompt = _prepare_task_analysis(state)
+    if prompt is None:
+        return result
+    
+    logger.debug("Task Analyzer: Invoking LLM for task analysis...")
+    try:
+        response_text, plan_status = await astream_until_status(_get_analysis_llm().astream(prompt), "PLAN_INFEASIBLE")
+    except Exception as e:
+        # Handle LLM invocation errors (network, API, timeout, etc.)
+        logger.warning("Task Analyzer: Error invoking LLM - %s: %s", type(e).__name__, e)
+        logger.debug("Task Analyzer: Returning NEEDS_CLARIFICATION status due to LLM error")
+        return result
+    return _remember_analysis(state, _parse_task_analysis(response_text.strip(), plan_status))
+
+
+@lru_cache(maxsize=None)
+def _get_analysis_llm():
+    """Get or create the task analysis model, bound to the strict _TASK_ANALYSIS_SCHEMA."""
+    return get_chat_model("gpt-4o-mini", 0.5).bind(response_format={
+        "type": "json_schema",
+        "json_schema": {"name": "TaskAnalysis", "strict": True, "schema": _TASK_ANALYSIS_SCHEMA},
+    })
+
+
+def _prepare_task_analysis(state: AgentState) -> Tuple[Dict, Optional[List[BaseMessage]]]:
+    """
+    Resolve task analysis up to the LLM call.
+    
+    Returns (result, None) when no LLM call is needed (intent mismatch), or
+    (result to use if the LLM call fails, analysis prompt).
+    """
+    logger.debug("Task Analyzer: Starting task analysis")
+    
+    intent_type = state.get("intent_type", "UNKNOWN")
+    
+    logger.debug("Task Analyzer: Intent type = %s", intent_type)
+    
+    if intent_type != "TASK_SCHEDULE":
+        logger.debug("Task Analyzer: Intent mismatch. Expected TASK_SCHEDULE, got %s", intent_type)
+        return {
+            "plan_status": "PLAN_INFEASIBLE",
+            "task_definition": {},
+            "explanation_payload": {"reason": "Intent is not TASK_SCHEDULE"}
+        }, None
+    
+    # Reuse the analysis produced in the same LLM call as the intent classification
+    # (that call has no response schema, so its shape is checked before use)
+    intent_analysis = state.get("intent_analysis")
+    if intent_analysis is not None:
+        if has_valid_plan_shape(intent_analysis, "task", ("estimated_time_minutes",)):
+            logger.debug("Task Analyzer: Using analysis from intent classification")
+            return _remember_analysis(state, _parse_task_analysis(intent_analysis)), None
+        logger.warning("Task Analyzer: Ignoring malformed analysis from intent classification: %s", intent_analysis)
+    
+    # Extract user message
+    user_message = get_last_user_message(state) or ""
+    
+    logger.debug("Task Analyzer: User message = %s", user_message)
+    
+    # A repeated request reuses its earlier analysis
+    cache_key = normalize_message(user_message)
+    with _analysis_cache_lock:
+        cached_result = _analysis_cache.pop(cache_key, None)
+        if cached_result is not None:
+            # Re-insert as most recently used
+            _analysis_cache[cache_key] = cached_result
+    if cached_result is not None:
+        logger.debug("Task Analyzer: Using cached analysis")
+        # Hand out a copy so callers can't alter the cache
+        return _copy_analysis(cached_result), None
+    
+    # Get current date and time for context
+    today = datetime.now()
+    date_context = format_date_context(today)
+    
+    logger.debug("Task Analyzer: %s", date_context)
+    
+    # Create simplified task analysis prompt - only extract essentials
+    prompt = f"""{date_context}
+
+User request: {user_message}
+
+Response (JSON only):"""
+    
+    # Returned as-is if the LLM call fails
+    llm_error_result = needs_clarification("task_definition", LLM_ERROR_QUESTION)
+    return llm_error_result, [SystemMessage(content=_SYSTEM_PROMPT), HumanMessage(content=prompt)]
+
+
+def _copy_analysis(result: Dict) -> Dict:
+    """Copy a cached analysis, including its task_definition."""
+    return {**result, "task_definition": dict(result["task_definition"])}
+
+
+def _remember_analysis(state: AgentState, result: Dict) -> Dict:
+    """Cache a PLAN_READY analysis under the normalized user message and return it."""
+    if result.get("plan_status") == "PLAN_READY":
+        cache_key = normalize_message(get_last_user_message(state) or "")
+        with _analysis_cache_lock:
+            if len(_analysis_cache) >= _ANALYSIS_CACHE_SIZE:
+                # Evict the least recently used entry (first in insertion order)
+                _analysis_cache.pop(next(iter(_analysis_cache)), None)
+            _analysis_cache[cache_key] = _copy_analysis(result)
+    return result
+
+
+def _parse_task_analysis(response_text: Union[str, Dict], plan_status: Optional[str] = None) -> Dict:
+    """
+    Turn the LLM's JSON response into the task_definition update, filling in defaults.
+    
+    Also accepts the already-parsed object produced alongside the intent classification.
+    """
+    if plan_status == "PLAN_INFEASIBLE":
+        # The stream was cut off once the status came in; nothing after it is needed
+        logger.debug("Task Analyzer: Plan infeasible, stopped reading the response early")
         return {
-            "plan_status": "NEEDS_CLARIFICATION",
+            "plan_status": "PLAN_INFEASIBLE",
             "task_definition": {},
-            "explanation_payload": {
-                "clarification_questions": ["I encountered an error processing your request. Could you please try again or rephrase your request?"]
-            }
+            "explanation_payload": {"reason": "Plan judged infeasible (stream aborted early)"}
         }
     
-    print(f"Task Analyzer: LLM response = {response_text}")
+    logger.debug("Task Analyzer: LLM response = %s", response_text)
     
-    # Try to extract JSON from response
+    # Structured output: the response is the JSON object itself
     try:
-        # Remove markdown code blocks if present
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
-        
-        task_data = json.loads(response_text)
-        print(f"Task Analyzer: Parsed task data = {task_data}")
+        task_data = json.loads(response_text) if isinstance(response_text, str) else response_text
+        logger.debug("Task Analyzer: Parsed task data = %s", task_data)
         
         task = task_data.get("task", {})
         plan_status = task_data.get("plan_status", "PLAN_INFEASIBLE")
         clarification_questions = task_data.get("clarification_questions", [])
         
-        print(f"Task Analyzer: Plan status = {plan_status}")
-        print(f"Task Analyzer: Task name = {task.get('task_name', 'N/A')}")
-        print(f"Task Analyzer: Estimated time (minutes) = {task.get('estimated_time_minutes', 'N/A')}")
-        print(f"Task Analyzer: Description = {task.get('description', 'N/A')}")
+        logger.debug("Task Analyzer: Plan status = %s", plan_status)
+        logger.debug("Task Analyzer: Task name = %s", task.get('task_name', 'N/A'))
+        logger.debug("Task Analyzer: Estimated time (minutes) = %s", task.get('estimated_time_minutes', 'N/A'))
+        logger.debug("Task Analyzer: Description = %s", task.get('description', 'N/A'))
         
         # Validate and set defaults
         if "estimated_time_minutes" not in task or task["estimated_time_minutes"] <= 0:
-            print(f"Task Analyzer: Estimated time invalid or missing ({task.get('estimated_time_minutes', 'N/A')}), setting default to 30 minutes")
+            logger.debug("Task Analyzer: Estimated time invalid or missing (%s), setting default to 30 minutes", task.get('estimated_time_minutes', 'N/A'))
             task["estimated_time_minutes"] = 30  # Default to 30 minutes if not specified or invalid
         
         # Set default description to empty string if not present
         if "description" not in task:
             task["description"] = ""
-            print("Task Analyzer: Description not specified, set to empty string")
+            logger.debug("Task Analyzer: Description not specified, set to empty string")
         
         result = {
             "task_definition": task,
@@ -158,25 +265,20 @@ IMPORTANT: Do NOT extract scheduling preferences (when, what time, which days) -
         }
         
         if clarification_questions:
-            print(f"Task Analyzer: Clarification questions = {clarification_questions}")
+            logger.debug("Task Analyzer: Clarification questions = %s", clarification_questions)
             result["explanation_payload"] = {"clarification_questions": clarification_questions}
         
-        print(f"Task Analyzer: Final task definition = {task}")
-        print("Task Analyzer: Task analysis complete")
-        print("=" * 50)
+        logger.debug("Task Analyzer: Final task definition = %s", task)
+        logger.debug("Task Analyzer: Task analysis complete")
         
         return result
-    except (json.JSONDecodeError, KeyError) as e:
-        # If parsing fails, mark as needing clarification
-        print(f"Task Analyzer: Error parsing JSON response - {type(e).__name__}: {e}")
-        print(f"Task Analyzer: Raw response text = {response_text}")
-        print("Task Analyzer: Returning NEEDS_CLARIFICATION status")
-        print("=" * 50)
-        return {
-            "plan_status": "NEEDS_CLARIFICATION",
-            "task_definition": {},
-            "explanation_payload": {
-                "clarification_questions": ["Could you provide more details about the task you'd like to schedule? Please include the task name and estimated time required."]
-            }
-        }
+    except (ValueError, KeyError, TypeError, AttributeError) as e:
+        # If parsing fails (invalid JSON, or JSON of the wrong shape), mark as needing clarification
+        logger.warning("Task Analyzer: Error parsing JSON response - %s: %s", type(e).__name__, e)
+        logger.debug("Task Analyzer: Raw response text = %s", response_text)
+        logger.debug("Task Analyzer: Returning NEEDS_CLARIFICATION status")
+        return needs_clarification(
+            "task_definition",
+            "Could you provide more details about the task you'd like to schedule? Please include the task name and estimated time required.",
+        )
 
@@ -1,11 +1,13 @@
 """Create calendar events node - creates events in calendar provider."""
 
-import json
+import logging
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict
 
 from app.ai_agent.state import AgentState
-from app.ai_agent.tools import create_calendar_event_tool
+from app.ai_agent.tools import create_calendar_events_batch
+
+logger = logging.getLogger(__name__)
 
 
 def create_calendar_events(state: AgentState) -> AgentState:
@@ -15,7 +17,7 @@ def create_calendar_events(state: AgentState) -> AgentState:
     Reads: selected_slots
     Writes: created_events
     """
-    print("[create_calendar_events] Starting to create calendar events...")
+    logger.debug("[create_calendar_events] Starting to create calendar events...")
     selected_slots = state.get("selected_slots", [])
     habit_definition = state.get("habit_definition", {})
     task_definition = state.get("task_definition", {})
@@ -28,17 +30,19 @@ def create_calendar_events(state: AgentState) -> AgentState:
         # For tasks: use task_name from task_definition
         event_name = task_definition.get("task_name", "Scheduled Task")
         description = task_definition.get("description", "")
-        print(f"[create_calendar_events] Creating event for task: {event_name}")
+        logger.debug("[create_calendar_events] Creating event for task: %s", event_name)
     else:
         # For habits: use habit_name from habit_definition
         event_name = habit_definition.get("habit_name", "Scheduled Habit")
         description = habit_definition.get("description", "")
-        print(f"[create_calendar_events] Creating events for habit: {event_name}")
+        logger.debug("[create_calendar_events] Creating events for habit: %s", event_name)
     
-    print(f"[create_calendar_events] Number of slots to create events for: {len(selected_slots)}")
+    logger.debug("[create_calendar_events] Number of slots to create events for: %s", len(selected_slots))
     
     created_events: List[Dict] = []
     
+    # Collect events for all valid slots so they can be created in one batch request
+    events_to_create: List[Dict] = []
     for i, slot in enumerate(selected_slots):
         start_time = slot.get("start")
         end_time = slot.get("end")
@@ -48,47 +52,53 @@ def create_calendar_events(state: AgentState) -> AgentState:
         
         # Buffer is now a gap BETWEEN events, not part of the event duration
         # So slot start/end times are already the event start/end times
-        print(f"[create_calendar_events] Processing slot {i+1}/{len(selected_slots)}: {start_time} to {end_time}")
-        
-        try:
-            # Use the calendar tool to create the event
-            result_json = create_calendar_event_tool.invoke({
-                "summary": event_name,
-                "start_time": start_time,
-                "end_time": end_time,
-                "description": description,
-                "calendar_id": "primary"
-            })
-            
-            # Parse the JSON response
-            result = json.loads(result_json)
-            
-            if result.get("success", False):
-                event_data = result.get("event", {})
-                created_event = {
-                    "id": event_data.get("id"),
-                    "summary": event_data.get("summary", event_name),
-                    "description": event_data.get("description", description),
-                    "start": event_data.get("start"),
-                    "end": event_data.get("end"),
-                    "location": event_data.get("location", ""),
-                    "htmlLink": event_data.get("htmlLink", ""),
-                    "status": "confirmed"
-                }
-                created_events.append(created_event)
-                print(f"[create_calendar_events] Successfully created event: {event_data.get('id')}")
-            else:
-                # Tool returned an error, log it but continue with other slots
-                error_msg = result.get("error", "Unknown error")
-                print(f"[create_calendar_events] Failed to create event: {error_msg}")
-                # In production, you might want to log this error
-                continue
-                
-        except Exception as e:
-            # If tool invocation fails, skip this slot and continue
-            print(f"[create_calendar_events] Exception while creating event: {str(e)}")
-            # In production, you might want to log this error
-            continue
+        logger.debug("[create_calendar_events] Processing slot %s/%s: %s to %s", i+1, len(selected_slots), start_time, end_time)
+        events_to_create.append({
+            "summary": event_name,
+            "start_time": start_time,
+            "end_time": end_time,
+            "description": description
+        })
+    
+    if not events_to_create:
+        logger.debug("[create_calendar_events] No valid slots to create events for")
+        return {"created_events": created_events}
+    
+    try:
+        # Create all events in a single batch request (the batch tool's underlying
+        # function, so the results are not serialized to JSON and parsed back)
+        result = create_calendar_events_batch(events=events_to_create, calendar_id="primary")
+    except Exception as e:
+        # If tool invocation fails, no events were created
+        logger.warning("[create_calendar_events] Exception while creating events: %s", e)
+        # In production, you might want to log this error
+        return {"created_events": created_events}
+    
+    if not result.get("success", False):
+        # Tool returned an error for the whole batch
+        error_msg = result.get("error", "Unknown error")
+        logger.warning("[create_calendar_events] Failed to create events: %s", error_msg)
+        return {"created_events": created_events}
+    
+    for event_result in result.get("results", []):
+        if event_result.get("success", False):
+            event_data = event_result.get("event", {})
+            created_event = {
+                "id": event_data.get("id"),
+                "summary": event_data.get("summary", event_name),
+                "description": event_data.get("description", description),
+                "start": event_data.get("start"),
+                "end": event_data.get("end"),
+                "location": event_data.get("location", ""),
+                "htmlLink": event_data.get("htmlLink", ""),
+                "status": "confirmed"
+            }
+            created_events.append(created_event)
+            logger.debug("[create_calendar_events] Successfully created event: %s", event_data.get('id'))
+        else:
+            # Event failed, log it but keep the other events
+            error_msg = event_result.get("error", "Unknown error")
+            logger.warning("[create_calendar_events] Failed to create event: %s", error_msg)
     
-    print(f"[create_calendar_events] Successfully created {len(created_events)} out of {len(selected_slots)} events")
+    logger.debug("[create_calendar_events] Successfully created %s out of %s events", len(created_events), len(selected_slots))
     return {"created_events": created_events}
\ No newline at end of file
@@ -1,26 +1,64 @@
 """Fetch calendar events node - retrieves events from calendar provider."""
 
-import json
+import asyncio
+import logging
 from datetime import datetime, timedelta, timezone
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from app.ai_agent.state import AgentState
-from app.ai_agent.tools import get_calendar_events_tool
+from app.ai_agent.tools import get_calendar_events
+
+logger = logging.getLogger(__name__)
 
 
 def fetch_calendar_events(state: AgentState) -> AgentState:
     """
     Fetch calendar events from the calendar provider.
     
-    Reads: time_range (from planning_horizon)
-    Writes: calendar_events_raw
+    Reads: time_range (from planning_horizon), calendar_events_prefetched
+    Writes: calendar_events_raw, calendar_events_prefetched
+    """
+    logger.debug("Fetch Calendar Events: Starting to fetch calendar events")
+    
+    # Events were already fetched by prefetch_calendar_events in this run
+    if state.get("calendar_events_prefetched"):
+        logger.debug("Fetch Calendar Events: Using prefetched calendar events")
+        # Clear the flag so a later pass (e.g. after rejection) fetches fresh events
+        return {"calendar_events_prefetched": False}
+    
+    try:
+        # Call the tool's underlying function: same result, without a JSON round-trip
+        result = get_calendar_events(**_prepare_fetch(state))
+        return _complete_fetch(result)
+    except Exception as e:
+        return _fetch_failed(e)
+
+
+async def afetch_calendar_events(state: AgentState) -> AgentState:
+    """
+    Async variant of fetch_calendar_events.
+    
+    The Google Calendar client is synchronous, so the request runs in a worker thread
+    and the event loop stays free for nodes running alongside it (e.g. task_analyzer
+    next to prefetch_calendar_events).
     """
-    print("=" * 50)
-    print("Fetch Calendar Events: Starting to fetch calendar events")
-    print("=" * 50)
+    logger.debug("Fetch Calendar Events: Starting to fetch calendar events")
     
+    if state.get("calendar_events_prefetched"):
+        logger.debug("Fetch Calendar Events: Using prefetched calendar events")
+        return {"calendar_events_prefetched": False}
+    
+    try:
+        result = await asyncio.to_thread(get_calendar_events, **_prepare_fetch(state))
+        return _complete_fetch(result)
+    except Exception as e:
+        return _fetch_failed(e)
+
+
+def _prepare_fetch(state: AgentState) -> Dict:
+    """Work out the time range to fetch and return the calendar tool arguments."""
     planning_horizon = state.get("planning_horizon", {})
-    print(f"Fetch Calendar Events: Planning horizon = {planning_horizon}")
+    logger.debug("Fetch Calendar Events: Planning horizon = %s", planning_horizon)
     
     # Extract time range from planning_horizon
     # Default to next 30 days if not specified
@@ -46,94 +84,99 @@ def fetch_calendar_events(state: AgentState) -> AgentState:
         if end_date.tzinfo is None:
             end_date = end_date.replace(tzinfo=timezone.utc)
     
-    print(f"Fetch Calendar Events: Start date = {start_date}")
-    print(f"Fetch Calendar Events: End date = {end_date}")
-    print(f"Fetch Calendar Events: Time range = {end_date - start_date}")
+    logger.debug("Fetch Calendar Events: Start date = %s", start_date)
+    logger.debug("Fetch Calendar Events: End date = %s", end_date)
+    logger.debug("Fetch Calendar Events: Time range = %s", end_date - start_date)
     
-    # Use the calendar tool to fetch events
-    try:
-        # Format dates as ISO strings for the tool
-        time_min = start_date.isoformat()
-        time_max = end_date.isoformat()
-        
-        print(f"Fetch Calendar Events: Invoking calendar tool...")
-        print(f"Fetch Calendar Events: time_min = {time_min}")
-        print(f"Fetch Calendar Events: time_max = {time_max}")
-        
-        # Invoke the tool directly
-        result_json = get_calendar_events_tool.invoke({
-            "calendar_id": "primary",
-            "max_results": 250,  # Get all events in range
-            "time_min": time_min,
-            "time_max": time_max
-        })
-        
-        # Parse the JSON response
-        result = json.loads(result_json)
+    # Format dates as ISO strings for the tool
+    time_min = start_date.isoformat()
+    time_max = end_date.isoformat()
+    
+    logger.debug("Fetch Calendar Events: Invoking calendar tool...")
+    logger.debug("Fetch Calendar Events: time_min = %s", time_min)
+    logger.debug("Fetch Calendar Events: time_max = %s", time_max)
+    
+    return {
+        "calendar_id": "primary",
+        "max_results": 250,  # Get all events in range
+        "time_min": time_min,
+        "time_max": time_max,
+    }
+
+
+def _complete_fetch(result: Dict) -> AgentState:
+    """Convert the calendar tool result into calendar_events_raw."""
+    if result.get("success", False):
+        # Convert tool response format to raw events format
+        tool_events = result.get("events", [])
+        logger.debug("Fetch Calendar Events: Successfully fetched %s events from calendar", len(tool_events))
+        # Convert to the format expected by normalize_calendar_events
+        raw_events: List[Dict] = [
+            {
+                "id": event.get("id"),
+                "summary": event.get("summary", "No title"),
+                "start": _time_field(event.get("start")),
+                "end": _time_field(event.get("end")),
+                "description": event.get("description", ""),
+                "location": event.get("location", "")
+            }
+            for event in tool_events
+        ]
         
-        if result.get("success", False):
-            # Convert tool response format to raw events format
-            tool_events = result.get("events", [])
-            print(f"Fetch Calendar Events: Successfully fetched {len(tool_events)} events from calendar")
-            raw_events: List[Dict] = []
-            
-            for event in tool_events:
-                # The tool returns start/end as strings (ISO format)
-                # Convert to the format expected by normalize_calendar_events
-                start_str = event.get("start", "")
-                end_str = event.get("end", "")
-                
-                # Determine if it's a dateTime or date (all-day event)
-                start_dict = {}
-                end_dict = {}
-                
-                if start_str:
-                    if "T" in start_str:
-                        # Has time component - it's a dateTime
-                        start_dict["dateTime"] = start_str
-                    else:
-                        # No time component - it's an all-day event
-                        start_dict["date"] = start_str
-                
-                if end_str:
-                    if "T" in end_str:
-                        # Has time component - it's a dateTime
-                        end_dict["dateTime"] = end_str
-                    else:
-                        # No time component - it's an all-day event
-                        end_dict["date"] = end_str
-                
-                raw_event = {
-                    "id": event.get("id"),
-                    "summary": event.get("summary", "No title"),
-                    "start": start_dict,
-                    "end": end_dict,
-                    "description": event.get("description", ""),
-                    "location": event.get("location", "")
-                }
-                raw_events.append(raw_event)
-            
-            print(f"Fetch Calendar Events: Converted {len(raw_events)} events to raw format")
-            print(f"Fetch Calendar Events: Sample events (first 3):")
+        logger.debug("Fetch Calendar Events: Converted %s events to raw format", len(raw_events))
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Fetch Calendar Events: Sample events (first 3):")
             for i, event in enumerate(raw_events[:3]):
-                print(f"  Event {i+1}: {event.get('summary', 'No title')} from {event.get('start', {})} to {event.get('end', {})}")
-            print("Fetch Calendar Events: Calendar fetch complete")
-            print("=" * 50)
-            return {"calendar_events_raw": raw_events}
-        else:
-            # Tool returned an error, return empty list
-            error_msg = result.get("error", "Unknown error")
-            print(f"Fetch Calendar Events: Tool returned error: {error_msg}")
-            print("Fetch Calendar Events: Returning empty events list")
-            print("=" * 50)
-            return {"calendar_events_raw": []}
-            
-    except Exception as e:
-        # If tool invocation fails, return empty list
-        # In production, you might want to log this error
-        print(f"Fetch Calendar Events: Exception occurred - {type(e).__name__}: {str(e)}")
-        import traceback
-        print(f"Fetch Calendar Events: Traceback:\n{traceback.format_exc()}")
-        print("Fetch Calendar Events: Returning empty events list")
-        print("=" * 50)
-        return {"calendar_events_raw": []}
\ No newline at end of file
+                logger.debug("  Event %s: %s from %s to %s", i + 1, event.get("summary", "No title"), event.get("start", {}), event.get("end", {}))
+        logger.debug("Fetch Calendar Events: Calendar fetch complete")
+        return {"calendar_events_raw": raw_events}
+    else:
+        # Tool returned an error, return empty list
+        error_msg = result.get("error", "Unknown error")
+        logger.warning("Fetch Calendar Events: Tool returned error: %s", error_msg)
+        logger.debug("Fetch Calendar Events: Returning empty events list")
+        return {"calendar_events_raw": []}
+
+
+def _time_field(value: Optional[str]) -> Dict:
+    """
+    Turn the tool's ISO start/end string into a Google-style start/end dict.
+    
+    A date is exactly YYYY-MM-DD, so anything longer has a time component (dateTime);
+    a bare date is an all-day event, and a missing value gives an empty dict.
+    """
+    if not value:
+        return {}
+    if len(value) > 10:
+        return {"dateTime": value}
+    return {"date": value}
+
+
+def _fetch_failed(error: Exception) -> AgentState:
+    """Log a failed calendar fetch and fall back to no events."""
+    # If tool invocation fails, return empty list
+    logger.warning("Fetch Calendar Events: Exception occurred - %s: %s", type(error).__name__, error, exc_info=True)
+    logger.debug("Fetch Calendar Events: Returning empty events list")
+    return {"calendar_events_raw": []}
+
+
+def prefetch_calendar_events(state: AgentState) -> AgentState:
+    """
+    Fetch calendar events ahead of the execution decision.
+    
+    Runs in parallel with task planning; fetch_calendar_events then reuses
+    the result instead of calling the calendar provider again.
+    
+    Reads: time_range (from planning_horizon)
+    Writes: calendar_events_raw, calendar_events_prefetched
+    """
+    result = fetch_calendar_events({**state, "calendar_events_prefetched": False})
+    result["calendar_events_prefetched"] = True
+    return result
+
+
+async def aprefetch_calendar_events(state: AgentState) -> AgentState:
+    """Async variant of prefetch_calendar_events."""
+    result = await afetch_calendar_events({**state, "calendar_events_prefetched": False})
+    result["calendar_events_prefetched"] = True
+    return result
\ No newline at end of file
@@ -1,10 +1,16 @@
 """Filter slots node - filters free slots based on plan constraints."""
 
+import logging
 from datetime import datetime, timedelta
-from typing import List, Dict
+from typing import Callable, Dict, Iterator, List, Tuple
 
 from app.ai_agent.state import AgentState
 
+logger = logging.getLogger(__name__)
+
+_MICROSECOND = timedelta(microseconds=1)
+_MINUTE_US = 60_000_000
+
 
 def filter_slots(state: AgentState) -> AgentState:
     """
@@ -13,17 +19,16 @@ def filter_slots(state: AgentState) -> AgentState:
     Reads: free_time_slots, plan (from habit_definition)
     Writes: filtered_slots
     """
-    print("[filter_slots] Starting to filter free time slots...")
+    logger.debug("[filter_slots] Starting to filter free time slots...")
     free_slots = state.get("free_time_slots", [])
     habit_definition = state.get("habit_definition", {})
     time_constraints = state.get("time_constraints", {})
     
-    print(f"[filter_slots] ===== INPUT STATE FIELDS =====")
-    print(f"[filter_slots] free_time_slots count: {len(free_slots)}")
+    logger.debug("[filter_slots] free_time_slots count: %s", len(free_slots))
     if free_slots:
-        print(f"[filter_slots] Sample free slot (first): {free_slots[0]}")
-    print(f"[filter_slots] habit_definition (full): {habit_definition}")
-    print(f"[filter_slots] time_constraints (full): {time_constraints}")
+        logger.debug("[filter_slots] Sample free slot (first): %s", free_slots[0])
+    logger.debug("[filter_slots] habit_definition (full): %s", habit_definition)
+    logger.debug("[filter_slots] time_constraints (full): %s", time_constraints)
     
     # Extract constraints from plan
     required_duration_minutes = habit_definition.get("duration_minutes", 30)
@@ -35,24 +40,93 @@ def filter_slots(state: AgentState) -> AgentState:
     preferred_times = time_constraints.get("preferred_times", [])  # e.g., ["09:00", "14:00"]
     days_of_week = time_constraints.get("days_of_week", [])  # e.g., [0, 1, 2, 3, 4] for weekdays
     
-    print(f"[filter_slots] ===== EXTRACTED FILTERING CRITERIA =====")
-    print(f"[filter_slots] Required duration: {required_duration_minutes} minutes")
-    print(f"[filter_slots] Max duration: {max_duration_minutes} minutes")
-    print(f"[filter_slots] Frequency: {frequency}")
-    print(f"[filter_slots] Buffer: {buffer_minutes} minutes")
-    print(f"[filter_slots] Preferred times: {preferred_times}")
-    print(f"[filter_slots] Days of week: {days_of_week}")
+    logger.debug("[filter_slots] Required duration: %s minutes", required_duration_minutes)
+    logger.debug("[filter_slots] Max duration: %s minutes", max_duration_minutes)
+    logger.debug("[filter_slots] Frequency: %s", frequency)
+    logger.debug("[filter_slots] Buffer: %s minutes", buffer_minutes)
+    logger.debug("[filter_slots] Preferred times: %s", preferred_times)
+    logger.debug("[filter_slots] Days of week: %s", days_of_week)
     
     candidate_slots: List[Dict] = []
     
     # Minimum slot size needed: just the required duration (buffer is gap between events, not part of event)
     min_slot_size_minutes = required_duration_minutes
     
+    # Constraint checks applied to each slot's start time
+    predicates = []
+    if days_of_week:
+        predicates.append(_on_days_of_week(days_of_week))
+    if preferred_times:
+        predicates.append(_near_preferred_times(preferred_times))
+    
+    for slot_start, slot_end, slot_duration in _iter_matching_slots(free_slots, min_slot_size_minutes, predicates):
+        # Break large slots into multiple smaller slots
+        # Buffer is a gap BETWEEN events, not part of the event duration
+        # Each event is: required_duration_minutes to max_duration_minutes
+        # Between consecutive events, there should be at least buffer_minutes gap
+        slot_span_us = (slot_end - slot_start) // _MICROSECOND
+        for start_us, end_us, event_minutes in _split_slot(slot_span_us, slot_duration, required_duration_minutes, max_duration_minutes, buffer_minutes):
+            # Create the candidate slot (event only, no buffer)
+            candidate_slots.append({
+                "start": (slot_start + timedelta(microseconds=start_us)).isoformat(),
+                "end": (slot_start + timedelta(microseconds=end_us)).isoformat(),
+                "duration_minutes": event_minutes,  # Just the event duration
+                "habit_duration_minutes": event_minutes,
+                "meets_constraints": True
+            })
+    
+    logger.debug("[filter_slots] Generated %s candidate slots from %s free slots", len(candidate_slots), len(free_slots))
+    return {"filtered_slots": candidate_slots}
+
+
+def _split_slot(slot_span_us: int, slot_duration: int, required_minutes: int, max_minutes: int, buffer_minutes: int) -> Iterator[Tuple[int, int, int]]:
+    """
+    Split one free slot into back-to-back events separated by buffer_minutes.
+    
+    Works on integer microsecond offsets from the slot start (no datetime or timedelta
+    objects per event) and yields (start offset, end offset, duration in minutes).
+    slot_duration is the slot's reported length and only bounds the first event.
+    """
+    current_us = 0
+    remaining_minutes = slot_duration
+    buffer_us = buffer_minutes * _MINUTE_US
+    
+    while remaining_minutes >= required_minutes:
+        # Calculate how much time we can use for this event (up to max_minutes)
+        event_minutes = min(max_minutes, remaining_minutes)
+        
+        # Ensure we have at least required_minutes
+        if event_minutes < required_minutes:
+            break
+        
+        event_end_us = current_us + event_minutes * _MINUTE_US
+        
+        # Make sure we don't exceed the original slot end time
+        if event_end_us > slot_span_us:
+            event_end_us = slot_span_us
+            event_minutes = int((event_end_us - current_us) / _MINUTE_US)
+            
+            # If the remaining time is less than minimum, break
+            if event_minutes < required_minutes:
+                break
+        
+        yield current_us, event_end_us, event_minutes
+        
+        # Move to next potential slot: event end + buffer (gap between events)
+        current_us = event_end_us + buffer_us
+        remaining_minutes = int((slot_span_us - current_us) / _MINUTE_US)
+
+
+def _iter_matching_slots(free_slots: List[Dict], min_duration_minutes: int, predicates: List[Callable[[datetime], bool]]) -> Iterator[Tuple[datetime, datetime, int]]:
+    """
+    Yield (start, end, duration_minutes) for each free slot that is long enough,
+    has valid ISO start/end times, and whose start satisfies every predicate.
+    """
     for slot in free_slots:
         slot_duration = slot.get("duration_minutes", 0)
         
         # Check if slot is long enough for at least one event
-        if slot_duration < min_slot_size_minutes:
+        if slot_duration < min_duration_minutes:
             continue
         
         # Parse slot times
@@ -62,75 +136,26 @@ def filter_slots(state: AgentState) -> AgentState:
         except (ValueError, KeyError):
             continue
         
-        # Check day of week constraint
-        if days_of_week:
-            slot_weekday = slot_start.weekday()  # 0 = Monday, 6 = Sunday
-            if slot_weekday not in days_of_week:
-                continue
-        
-        # Check preferred time constraints
-        if preferred_times:
-            slot_time = slot_start.strftime("%H:%M")
-            matches_preferred = False
-            for preferred_time in preferred_times:
-                # Simple time matching (could be more sophisticated)
-                pref_hour, pref_min = map(int, preferred_time.split(":"))
-                slot_hour = slot_start.hour
-                slot_min = slot_start.minute
-                
-                # Allow ±1 hour window
-                if abs(slot_hour - pref_hour) <= 1:
-                    matches_preferred = True
-                    break
-            
-            if not matches_preferred:
-                continue
-        
-        # Break large slots into multiple smaller slots
-        # Buffer is a gap BETWEEN events, not part of the event duration
-        # Each event is: required_duration_minutes to max_duration_minutes
-        # Between consecutive events, there should be at least buffer_minutes gap
-        
-        current_time = slot_start
-        remaining_duration = slot_duration
-        
-        while remaining_duration >= min_slot_size_minutes:
-            # Calculate how much time we can use for this event (up to max_duration_minutes)
-            available_for_habit = min(max_duration_minutes, remaining_duration)
-            
-            # Ensure we have at least required_duration_minutes
-            if available_for_habit < required_duration_minutes:
-                break
-            
-            # Create an event slot: just the habit duration (no buffer included)
-            event_start = current_time
-            event_end = event_start + timedelta(minutes=available_for_habit)
-            
-            # Make sure we don't exceed the original slot end time
-            if event_end > slot_end:
-                event_end = slot_end
-                available_for_habit = int((event_end - event_start).total_seconds() / 60)
-                
-                # If the remaining time is less than minimum, break
-                if available_for_habit < required_duration_minutes:
-                    break
-            
-            # Create the candidate slot (event only, no buffer)
-            candidate_slots.append({
-                "start": event_start.isoformat(),
-                "end": event_end.isoformat(),
-                "duration_minutes": available_for_habit,  # Just the event duration
-                "habit_duration_minutes": available_for_habit,
-                "meets_constraints": True
-            })
-            
-            # Move to next potential slot: event end + buffer (gap between events)
-            current_time = event_end + timedelta(minutes=buffer_minutes)
-            remaining_duration = int((slot_end - current_time).total_seconds() / 60)
-            
-            # If remaining duration is less than minimum, stop
-            if remaining_duration < min_slot_size_minutes:
-                break
-    
-    print(f"[filter_slots] Generated {len(candidate_slots)} candidate slots from {len(free_slots)} free slots")
-    return {"filtered_slots": candidate_slots}
\ No newline at end of file
+        if all(predicate(slot_start) for predicate in predicates):
+            yield slot_start, slot_end, slot_duration
+
+
+def _on_days_of_week(days_of_week: List[int]) -> Callable[[datetime], bool]:
+    """Build a predicate checking the day of week constraint (0 = Monday, 6 = Sunday)."""
+    allowed_days = frozenset(days_of_week)
+    def predicate(slot_start: datetime) -> bool:
+        return slot_start.weekday() in allowed_days
+    return predicate
+
+
+def _near_preferred_times(preferred_times: List[str]) -> Callable[[datetime], bool]:
+    """Build a predicate checking the preferred time constraints (e.g., ["09:00", "14:00"])."""
+    # Allow ±1 hour window around each preferred hour; parsed once, not per slot
+    allowed_hours = frozenset(
+        int(preferred_time.split(":")[0]) + offset
+        for preferred_time in preferred_times
+        for offset in (-1, 0, 1)
+    )
+    def predicate(slot_start: datetime) -> bool:
+        return slot_start.hour in allowed_hours
+    return predicate
@@ -1,10 +1,25 @@
 """Normalize calendar events node - standardizes event format and timezone."""
 
+import logging
+import sys
 from datetime import datetime
+from functools import lru_cache
 from typing import List, Dict
 
 from app.ai_agent.state import AgentState
 
+logger = logging.getLogger(__name__)
+
+# ISO parsing and epoch conversion shared with compute_free_slots, so both nodes
+# agree on what start_ts/end_ts mean
+if sys.version_info >= (3, 11):
+    # fromisoformat accepts a trailing "Z" (UTC) natively
+    parse_iso = datetime.fromisoformat
+else:
+    def parse_iso(value: str) -> datetime:
+        """Parse an ISO 8601 string, accepting a trailing "Z" for UTC."""
+        return datetime.fromisoformat(value.replace("Z", "+00:00"))
+
 
 def normalize_calendar_events(state: AgentState) -> AgentState:
     """
@@ -13,9 +28,9 @@ def normalize_calendar_events(state: AgentState) -> AgentState:
     Reads: calendar_events_raw
     Writes: calendar_events_normalized
     """
-    print("[normalize_calendar_events] Starting to normalize calendar events...")
+    logger.debug("[normalize_calendar_events] Starting to normalize calendar events...")
     raw_events = state.get("calendar_events_raw", [])
-    print(f"[normalize_calendar_events] Number of raw events to normalize: {len(raw_events)}")
+    logger.debug("[normalize_calendar_events] Number of raw events to normalize: %s", len(raw_events))
     
     normalized_events: List[Dict] = []
     skipped_count = 0
@@ -55,7 +70,26 @@ def normalize_calendar_events(state: AgentState) -> AgentState:
             "timezone": start_data.get("timeZone", "UTC")
         }
         
+        # Parse timestamps once here so downstream nodes can work with epoch seconds
+        try:
+            normalized_event["start_ts"] = to_epoch_seconds(start_time)
+            normalized_event["end_ts"] = to_epoch_seconds(end_time)
+        except ValueError:
+            # Leave unparseable events without timestamps; compute_free_slots skips them
+            normalized_event.pop("start_ts", None)
+        
         normalized_events.append(normalized_event)
     
-    print(f"[normalize_calendar_events] Normalized {len(normalized_events)} events (skipped {skipped_count} invalid events)")
-    return {"calendar_events_normalized": normalized_events}
\ No newline at end of file
+    logger.debug("[normalize_calendar_events] Normalized %s events (skipped %s invalid events)", len(normalized_events), skipped_count)
+    return {"calendar_events_normalized": normalized_events}
+
+
+@lru_cache(maxsize=4096)
+def to_epoch_seconds(value: str) -> int:
+    """
+    Parse an ISO 8601 string into integer epoch seconds.
+    
+    Cached because the same calendar is re-fetched and re-normalized on
+    every scheduling request (and compute_free_slots parses the same strings).
+    """
+    return int(parse_iso(value).timestamp())
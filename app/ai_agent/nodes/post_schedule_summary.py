@@ -13,7 +13,6 @@ def post_schedule_summary(state: AgentState) -> AgentState:
     Reads: created_events
     Writes: messages (append assistant summary)
     """
-    messages = state.get("messages", [])
     created_events = state.get("created_events", [])
     habit_definition = state.get("habit_definition", {})
     
@@ -31,4 +30,4 @@ def post_schedule_summary(state: AgentState) -> AgentState:
     
     summary_message = AIMessage(content=summary_text)
     
-    return {"messages": messages + [summary_message]}
\ No newline at end of file
+    return {"messages": [summary_message]}
\ No newline at end of file
@@ -1,14 +1,17 @@
 """Select slots node - chooses final slots for scheduling."""
 
+import json
+import logging
 from datetime import datetime, timedelta
 from typing import List, Dict
-import json
 
-from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage
 
+from app.ai_agent.nodes.control_nodes._llm import get_json_chat_model
 from app.ai_agent.state import AgentState
 
+logger = logging.getLogger(__name__)
+
 
 def select_slots(state: AgentState) -> AgentState:
     """
@@ -17,9 +20,7 @@ def select_slots(state: AgentState) -> AgentState:
     Reads: filtered_slots (candidate_slots), habit_definition or task_definition, intent_type
     Writes: selected_slots
     """
-    print("=" * 50)
-    print("Select Slots: Starting to select final slots")
-    print("=" * 50)
+    logger.debug("Select Slots: Starting to select final slots")
     
     habit_definition = state.get("habit_definition", {})
     task_definition = state.get("task_definition", {})
@@ -32,23 +33,22 @@ def select_slots(state: AgentState) -> AgentState:
     # For habits: use filtered_slots (from filter_slots node)
     if is_task:
         candidate_slots = state.get("free_time_slots", [])
-        print(f"Select Slots: Using free_time_slots (TASK mode) - {len(candidate_slots)} slots")
+        logger.debug("Select Slots: Using free_time_slots (TASK mode) - %s slots", len(candidate_slots))
     else:
         candidate_slots = state.get("filtered_slots", [])
-        print(f"Select Slots: Using filtered_slots (HABIT mode) - {len(candidate_slots)} slots")
+        logger.debug("Select Slots: Using filtered_slots (HABIT mode) - %s slots", len(candidate_slots))
     
-    print(f"Select Slots: Intent type = {intent_type}")
-    print(f"Select Slots: Has habit_definition = {bool(habit_definition)}")
-    print(f"Select Slots: Has task_definition = {bool(task_definition)}")
+    logger.debug("Select Slots: Intent type = %s", intent_type)
+    logger.debug("Select Slots: Has habit_definition = %s", bool(habit_definition))
+    logger.debug("Select Slots: Has task_definition = %s", bool(task_definition))
     
     if not candidate_slots:
-        print("Select Slots: No candidate slots available, returning empty selection")
-        print("=" * 50)
+        logger.debug("Select Slots: No candidate slots available, returning empty selection")
         return {"selected_slots": []}
     
     if is_task:
         # Task-specific logic: select only ONE slot
-        print("Select Slots: Processing as TASK (single event)")
+        logger.debug("Select Slots: Processing as TASK (single event)")
         
         # Extract minimal task information
         task_name = task_definition.get("task_name", "task")
@@ -73,11 +73,11 @@ def select_slots(state: AgentState) -> AgentState:
         tomorrow_str = tomorrow.strftime("%Y-%m-%d")
         tomorrow_day_name = tomorrow.strftime("%A")
         
-        print(f"Select Slots: Task name = {task_name}")
-        print(f"Select Slots: Estimated time = {estimated_time_minutes} minutes")
-        print(f"Select Slots: Today is {today_day_name}, {today_str} at {today_time}")
-        print(f"Select Slots: Tomorrow is {tomorrow_day_name}, {tomorrow_str}")
-        print(f"Select Slots: User's original request = {user_message[:100]}..." if len(user_message) > 100 else f"Select Slots: User's original request = {user_message}")
+        logger.debug("Select Slots: Task name = %s", task_name)
+        logger.debug("Select Slots: Estimated time = %s minutes", estimated_time_minutes)
+        logger.debug("Select Slots: Today is %s, %s at %s", today_day_name, today_str, today_time)
+        logger.debug("Select Slots: Tomorrow is %s, %s", tomorrow_day_name, tomorrow_str)
+        logger.debug("Select Slots: User's original request = %s", user_message[:100] + "..." if len(user_message) > 100 else user_message)
         
         # For tasks, we only need to select 1 slot
         num_slots_to_select = 1
@@ -85,7 +85,7 @@ def select_slots(state: AgentState) -> AgentState:
         
     else:
         # Habit-specific logic: select multiple slots
-        print("Select Slots: Processing as HABIT (multiple events)")
+        logger.debug("Select Slots: Processing as HABIT (multiple events)")
         
         # Extract scheduling preferences
         frequency = habit_definition.get("frequency", "daily")
@@ -94,11 +94,11 @@ def select_slots(state: AgentState) -> AgentState:
         num_occurrences = habit_definition.get("num_occurrences")
         habit_name = habit_definition.get("habit_name", "habit")
         
-        print(f"Select Slots: Habit name = {habit_name}")
-        print(f"Select Slots: Frequency = {frequency}")
-        print(f"Select Slots: Required duration = {required_duration_minutes} minutes")
-        print(f"Select Slots: Buffer between events = {buffer_minutes} minutes")
-        print(f"Select Slots: Number of occurrences = {num_occurrences}")
+        logger.debug("Select Slots: Habit name = %s", habit_name)
+        logger.debug("Select Slots: Frequency = %s", frequency)
+        logger.debug("Select Slots: Required duration = %s minutes", required_duration_minutes)
+        logger.debug("Select Slots: Buffer between events = %s minutes", buffer_minutes)
+        logger.debug("Select Slots: Number of occurrences = %s", num_occurrences)
         
         # Determine how many slots to select
         if num_occurrences is not None:
@@ -114,10 +114,7 @@ def select_slots(state: AgentState) -> AgentState:
             else:
                 num_slots_to_select = 1
     
-    print(f"Select Slots: Target number of slots to select = {num_slots_to_select}")
-    
-    # Use LLM to intelligently select slots
-    llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.3)
+    logger.debug("Select Slots: Target number of slots to select = %s", num_slots_to_select)
     
     # Prepare candidate slots data for LLM (limit to reasonable number to avoid token limits)
     # Sort by start time and take up to 50 candidates
@@ -375,23 +372,19 @@ Candidate Slots (sorted by start time):
 
 Response (JSON only):"""
     
-    print(f"Select Slots: Invoking LLM for slot selection ({'TASK' if is_task else 'HABIT'} mode)...")
+    logger.debug("Select Slots: Invoking LLM for slot selection (%s mode)...", "TASK" if is_task else "HABIT")
     try:
-        response = llm.invoke(prompt)
+        # Use LLM to intelligently select slots
+        # JSON mode: the response is a bare JSON object, never wrapped in markdown fences
+        response = get_json_chat_model("gpt-4o-mini", 0.3).invoke(prompt)
         response_text = response.content.strip()
         
-        print(f"Select Slots: LLM response = {response_text}")
-        
-        # Extract JSON from response
-        if "```json" in response_text:
-            response_text = response_text.split("```json")[1].split("```")[0].strip()
-        elif "```" in response_text:
-            response_text = response_text.split("```")[1].split("```")[0].strip()
+        logger.debug("Select Slots: LLM response = %s", response_text)
         
         result_data = json.loads(response_text)
         reasoning = result_data.get("reasoning", "")
         
-        print(f"Select Slots: LLM reasoning = {reasoning}")
+        logger.debug("Select Slots: LLM reasoning = %s", reasoning)
         
         # Handle task vs habit response format
         if is_task:
@@ -399,8 +392,8 @@ Response (JSON only):"""
             selected_slot_index = result_data.get("selected_slot_index")
             task_start_time_str = result_data.get("task_start_time")
             
-            print(f"Select Slots: LLM selected slot index = {selected_slot_index}")
-            print(f"Select Slots: LLM selected task start time = {task_start_time_str}")
+            logger.debug("Select Slots: LLM selected slot index = %s", selected_slot_index)
+            logger.debug("Select Slots: LLM selected task start time = %s", task_start_time_str)
             
             if selected_slot_index is None or task_start_time_str is None:
                 raise ValueError("LLM response missing selected_slot_index or task_start_time")
@@ -424,12 +417,12 @@ Response (JSON only):"""
             
             # Validate that task fits within free slot
             if task_start_time < free_slot_start:
-                print(f"Select Slots: WARNING - Task start time {task_start_time} is before free slot start {free_slot_start}. Adjusting to free slot start.")
+                logger.warning("Select Slots: Task start time %s is before free slot start %s. Adjusting to free slot start.", task_start_time, free_slot_start)
                 task_start_time = free_slot_start
                 task_end_time = task_start_time + timedelta(minutes=estimated_time_minutes)
             
             if task_end_time > free_slot_end:
-                print(f"Select Slots: WARNING - Task end time {task_end_time} exceeds free slot end {free_slot_end}. Adjusting to fit within slot.")
+                logger.warning("Select Slots: Task end time %s exceeds free slot end %s. Adjusting to fit within slot.", task_end_time, free_slot_end)
                 task_end_time = free_slot_end
                 task_start_time = task_end_time - timedelta(minutes=estimated_time_minutes)
                 if task_start_time < free_slot_start:
@@ -444,12 +437,12 @@ Response (JSON only):"""
             }
             selected_slots = [selected_slot]
             
-            print(f"Select Slots: Created task slot: {task_start_time} to {task_end_time} ({estimated_time_minutes} min)")
-            print(f"Select Slots: Within free slot: {free_slot_start} to {free_slot_end} ({free_slot.get('duration_minutes', 0)} min)")
+            logger.debug("Select Slots: Created task slot: %s to %s (%s min)", task_start_time, task_end_time, estimated_time_minutes)
+            logger.debug("Select Slots: Within free slot: %s to %s (%s min)", free_slot_start, free_slot_end, free_slot.get('duration_minutes', 0))
         else:
             # For habits: Use the old format with selected_indices
             selected_indices = result_data.get("selected_indices", [])
-            print(f"Select Slots: LLM selected indices = {selected_indices}")
+            logger.debug("Select Slots: LLM selected indices = %s", selected_indices)
             
             # Map indices back to actual slots
             selected_slots = []
@@ -459,22 +452,25 @@ Response (JSON only):"""
                 if 0 <= slot_idx < len(sorted_candidates):
                     selected_slots.append(sorted_candidates[slot_idx])
                     slot_start = datetime.fromisoformat(sorted_candidates[slot_idx]["start"])
-                    print(f"Select Slots: Selected slot {len(selected_slots)}: {slot_start} (duration: {sorted_candidates[slot_idx].get('duration_minutes', 0)} min)")
+                    logger.debug("Select Slots: Selected slot %s: %s (duration: %s min)", len(selected_slots), slot_start, sorted_candidates[slot_idx].get('duration_minutes', 0))
         
         # If LLM didn't select enough, fall back to simple selection (only for habits, tasks should always be 1)
         if not is_task and len(selected_slots) < num_slots_to_select and len(selected_slots) < len(sorted_candidates):
-            print(f"Select Slots: LLM selected {len(selected_slots)} slots, but need {num_slots_to_select}. Adding more slots...")
+            logger.debug("Select Slots: LLM selected %s slots, but need %s. Adding more slots...", len(selected_slots), num_slots_to_select)
             # Add remaining slots in order, ensuring buffer requirement
             buffer_minutes = habit_definition.get("buffer_minutes", 15)
             last_end_time = None
             if selected_slots:
                 last_end_time = datetime.fromisoformat(selected_slots[-1]["end"])
             
+            # Hashable (start, end) keys make the already-selected check O(1)
+            selected_keys = {(slot["start"], slot["end"]) for slot in selected_slots}
+            
             for slot in sorted_candidates:
                 if len(selected_slots) >= num_slots_to_select:
                     break
                 
-                if slot in selected_slots:
+                if (slot["start"], slot["end"]) in selected_keys:
                     continue
                 
                 slot_start = datetime.fromisoformat(slot["start"])
@@ -489,16 +485,16 @@ Response (JSON only):"""
                 # Check duration requirement
                 if slot.get("duration_minutes", 0) >= required_duration_minutes:
                     selected_slots.append(slot)
+                    selected_keys.add((slot["start"], slot["end"]))
                     last_end_time = slot_end
         
-        print(f"Select Slots: Selected {len(selected_slots)} slot(s) out of {len(candidate_slots)} candidates")
-        print("Select Slots: Slot selection complete")
-        print("=" * 50)
+        logger.debug("Select Slots: Selected %s slot(s) out of %s candidates", len(selected_slots), len(candidate_slots))
+        logger.debug("Select Slots: Slot selection complete")
         return {"selected_slots": selected_slots}
         
     except (json.JSONDecodeError, KeyError, ValueError, Exception) as e:
-        print(f"Select Slots: LLM selection failed - {type(e).__name__}: {str(e)}")
-        print("Select Slots: Falling back to simple selection...")
+        logger.warning("Select Slots: LLM selection failed - %s: %s", type(e).__name__, e)
+        logger.debug("Select Slots: Falling back to simple selection...")
         
         # Fallback to simple selection logic
         selected_slots = []
@@ -549,14 +545,13 @@ Response (JSON only):"""
                         "original_free_slot_index": None  # Fallback, no index available
                     }
                     selected_slots.append(selected_slot)
-                    print(f"Select Slots: Fallback - Created task slot: {task_start_time} to {task_end_time} ({estimated_time_minutes} min)")
+                    logger.debug("Select Slots: Fallback - Created task slot: %s to %s (%s min)", task_start_time, task_end_time, estimated_time_minutes)
                     break  # For tasks, we only need one slot
                 else:
                     # For habits: use the slot as-is
                     selected_slots.append(slot)
                     last_selected_end_time = slot_end
         
-        print(f"Select Slots: Fallback: Selected {len(selected_slots)} slot(s)")
-        print("Select Slots: Slot selection complete")
-        print("=" * 50)
+        logger.debug("Select Slots: Fallback: Selected %s slot(s)", len(selected_slots))
+        logger.debug("Select Slots: Slot selection complete")
         return {"selected_slots": selected_slots}
\ No newline at end of file
@@ -1,6 +1,8 @@
 """Tool execution node for processing tool calls."""
 
 import json
+import logging
+
 from langchain_core.messages import ToolMessage
 
 from app.ai_agent.state import AgentState
@@ -10,6 +12,8 @@ from app.ai_agent.tools import (
     find_available_slots_tool
 )
 
+logger = logging.getLogger(__name__)
+
 
 def tool_node(state: AgentState) -> AgentState:
     """
@@ -35,7 +39,7 @@ def tool_node(state: AgentState) -> AgentState:
         tool_call_id = tool_call.get("id")
         
         # Execute the appropriate tool
-        print(f"Executing tool: {tool_name}")
+        logger.debug("Executing tool: %s", tool_name)
         if tool_name == "get_calendar_events_tool":
             result = get_calendar_events_tool.invoke(tool_args)
         elif tool_name == "create_calendar_event_tool":
@@ -52,4 +56,5 @@ def tool_node(state: AgentState) -> AgentState:
         )
         tool_messages.append(tool_message)
     
-    return {"messages": messages + tool_messages}
+    # Return only the tool results; the messages reducer appends them to the history
+    return {"messages": tool_messages}
@@ -12,6 +12,25 @@ All routing functions follow the pattern:
 
 from app.ai_agent.state import AgentState
 
+# Routing tables, built once at import and used as O(1) lookups on every
+# conditional edge traversal
+_INTENT_ROUTES = {
+    "HABIT_SCHEDULE": "HABIT_SCHEDULE",
+    "TASK_SCHEDULE": ["TASK_SCHEDULE", "PREFETCH_CALENDAR"],
+    "CALENDAR_ANALYSIS": "CALENDAR_ANALYSIS",
+    "UNKNOWN": "UNKNOWN",
+}
+
+# Where CHANGES_REQUESTED / post-compute_free_slots go, per intent (default: filter_slots)
+_SLOT_ROUTES = {
+    "TASK_SCHEDULE": "select_slots",
+}
+
+# Where normalize_calendar_events goes, per intent (default: compute_free_slots)
+_NORMALIZE_ROUTES = {
+    "CALENDAR_ANALYSIS": "calendar_insights",
+}
+
 
 def should_continue(state: AgentState) -> str:
     """
@@ -44,14 +63,26 @@ def route_by_intent(state: AgentState) -> str:
     """
     Route based on the classified user intent.
     
+    For TASK_SCHEDULE, also fans out to "PREFETCH_CALENDAR" so calendar
+    events are fetched while the task is being analyzed (the fetch does not
+    depend on the task definition). The prefetch starts before the task's
+    plan_status is known, so a task that then needs clarification or is
+    infeasible costs one unused Calendar API read; it is skipped when the
+    analysis returned with the intent already says the plan isn't ready.
+    
     Args:
         state: Current agent state with intent_type field
         
     Returns:
-        Intent type string: "HABIT_SCHEDULE", "TASK_SCHEDULE", 
-        "CALENDAR_ANALYSIS", or "UNKNOWN"
+        Intent type string: "HABIT_SCHEDULE", "CALENDAR_ANALYSIS", or "UNKNOWN",
+        or ["TASK_SCHEDULE", "PREFETCH_CALENDAR"] for tasks
     """
-    return state["intent_type"]
+    intent_type = state.get("intent_type")
+    if intent_type == "TASK_SCHEDULE":
+        intent_analysis = state.get("intent_analysis")
+        if isinstance(intent_analysis, dict) and intent_analysis.get("plan_status", "PLAN_READY") != "PLAN_READY":
+            return "TASK_SCHEDULE"
+    return _INTENT_ROUTES.get(intent_type, "UNKNOWN")
 
 
 def route_by_plan_status(state: AgentState) -> str:
@@ -102,11 +133,7 @@ def route_by_approval_state(state: AgentState) -> str:
     # For CHANGES_REQUESTED, route based on intent type
     # Tasks skip filter_slots, habits go through filter_slots
     if approval_state == "CHANGES_REQUESTED":
-        intent_type = state.get("intent_type", "UNKNOWN")
-        if intent_type == "TASK_SCHEDULE":
-            return "select_slots"  # Tasks go directly to select_slots
-        else:
-            return "filter_slots"  # Habits go through filter_slots
+        return _SLOT_ROUTES.get(state.get("intent_type"), "filter_slots")
     
     return approval_state
 
@@ -123,11 +150,7 @@ def route_by_intent_after_slots(state: AgentState) -> str:
     Returns:
         "select_slots" for tasks, "filter_slots" for habits
     """
-    intent_type = state.get("intent_type", "UNKNOWN")
-    if intent_type == "TASK_SCHEDULE":
-        return "select_slots"
-    else:
-        return "filter_slots"
+    return _SLOT_ROUTES.get(state.get("intent_type"), "filter_slots")
 
 
 def route_by_intent_after_normalize(state: AgentState) -> str:
@@ -142,8 +165,4 @@ def route_by_intent_after_normalize(state: AgentState) -> str:
     Returns:
         "calendar_insights" for CALENDAR_ANALYSIS, "compute_free_slots" for scheduling
     """
-    intent_type = state.get("intent_type", "UNKNOWN")
-    if intent_type == "CALENDAR_ANALYSIS":
-        return "calendar_insights"
-    else:
-        return "compute_free_slots"
+    return _NORMALIZE_ROUTES.get(state.get("intent_type"), "compute_free_slots")
@@ -3,10 +3,14 @@
 from typing import TypedDict, Annotated
 from typing import Literal, Optional, List
 
+from langgraph.graph.message import add_messages
+
 class AgentState(TypedDict):
     """State for the agent graph."""
-    # Conversation history
-    messages: Annotated[list, "List of messages in the conversation"]
+    # Conversation history (nodes return only new messages; add_messages appends them)
+    messages: Annotated[list, "List of messages in the conversation", add_messages]
+    last_user_msg_index: Annotated[Optional[int], "Index in messages of the latest user message (set by intent_classifier)"]
+    intent_analysis: Annotated[Optional[dict], "Planner output returned with the intent classification (set by intent_classifier; None means the planner makes its own LLM call)"]
 
     # Routing & control
     intent_type: Annotated[Literal[
@@ -37,6 +41,7 @@ class AgentState(TypedDict):
 
     # Execution artifacts
     calendar_events_raw: Annotated[List[dict], "Raw calendar events fetched from provider"] 
+    calendar_events_prefetched: Annotated[Optional[bool], "Whether calendar_events_raw was prefetched in parallel with planning in this run (reset by intent_classifier)"]
     calendar_events_normalized: Annotated[List[dict], "Timezone-aligned, conflict-free events"]
     free_time_slots: Annotated[List[dict], "All available time windows"]
     filtered_slots: Annotated[List[dict], "Slots that satisfy constraints"]
@@ -1,13 +1,19 @@
 """Tools for the AI agent."""
 
 from app.ai_agent.tools.calendar_tools import (
+    get_calendar_events,
+    create_calendar_events_batch,
     get_calendar_events_tool,
     create_calendar_event_tool,
+    create_calendar_events_tool,
     find_available_slots_tool
 )
 
 __all__ = [
+    "get_calendar_events",
+    "create_calendar_events_batch",
     "get_calendar_events_tool",
     "create_calendar_event_tool",
+    "create_calendar_events_tool",
     "find_available_slots_tool"
 ]
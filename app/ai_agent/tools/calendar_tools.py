@@ -19,6 +19,9 @@ if src_path not in sys.path:
 from calendar_repository import GoogleCalendarRepository
 from time_slot_finder import TimeSlotFinder
 
+# Event fields the tools read; the API omits everything else (attendees, reminders, ...)
+_EVENT_LIST_FIELDS = "items(id,summary,start,end,description,location)"
+
 # Initialize calendar repository (singleton pattern)
 _calendar_repo = None
 
@@ -30,27 +33,22 @@ def get_calendar_repository():
     return _calendar_repo
 
 
-@tool
-def get_calendar_events_tool(
+def get_calendar_events(
     calendar_id: str = "primary",
     max_results: int = 10,
     time_min: Optional[str] = None,
     time_max: Optional[str] = None
-) -> str:
+) -> dict:
     """
     Get calendar events from a specified calendar.
     
-    Args:
-        calendar_id: Calendar identifier (default: "primary")
-        max_results: Maximum number of events to return (default: 10)
-        time_min: Lower bound for event start time in ISO format (optional)
-        time_max: Upper bound for event end time in ISO format (optional)
+    Same result as get_calendar_events_tool, as a dict rather than a JSON string, so
+    graph nodes can use it without serializing and re-parsing every event.
     
     Returns:
-        JSON string containing list of events with their details
+        Dict with "success" and either "count"/"events" or "error"
     """
     try:
-        import json
         import datetime
         
         repo = get_calendar_repository()
@@ -70,7 +68,8 @@ def get_calendar_events_tool(
             time_max=time_max_dt,
             max_results=max_results,
             single_events=True,
-            order_by="startTime"
+            order_by="startTime",
+            fields=_EVENT_LIST_FIELDS
         )
         
         # Format events for response
@@ -86,17 +85,41 @@ def get_calendar_events_tool(
             }
             formatted_events.append(formatted_event)
         
-        return json.dumps({
+        return {
             "success": True,
             "count": len(formatted_events),
             "events": formatted_events
-        }, indent=2)
+        }
         
     except Exception as e:
-        return json.dumps({
+        return {
             "success": False,
             "error": str(e)
-        })
+        }
+
+
+@tool
+def get_calendar_events_tool(
+    calendar_id: str = "primary",
+    max_results: int = 10,
+    time_min: Optional[str] = None,
+    time_max: Optional[str] = None
+) -> str:
+    """
+    Get calendar events from a specified calendar.
+    
+    Args:
+        calendar_id: Calendar identifier (default: "primary")
+        max_results: Maximum number of events to return (default: 10)
+        time_min: Lower bound for event start time in ISO format (optional)
+        time_max: Upper bound for event end time in ISO format (optional)
+    
+    Returns:
+        JSON string containing list of events with their details
+    """
+    import json
+    
+    return json.dumps(get_calendar_events(calendar_id, max_results, time_min, time_max), indent=2)
 
 
 @tool
@@ -171,6 +194,99 @@ def create_calendar_event_tool(
         })
 
 
+def create_calendar_events_batch(
+    events: List[dict],
+    calendar_id: str = "primary"
+) -> dict:
+    """
+    Create multiple calendar events in a single batch request.
+    
+    Same result as create_calendar_events_tool, as a dict rather than a JSON string.
+    
+    Returns:
+        Dict with "success" and either "count"/"results" (one per event, in order) or "error"
+    """
+    try:
+        import datetime
+        
+        repo = get_calendar_repository()
+        
+        # Parse datetime strings per event, so a malformed event fails on its own
+        # instead of failing the whole batch
+        results: List[Optional[dict]] = [None] * len(events)
+        event_specs = []
+        spec_indices = []
+        for index, event in enumerate(events):
+            try:
+                end_time = event.get("end_time")
+                event_specs.append({
+                    "summary": event["summary"],
+                    "start_time": datetime.datetime.fromisoformat(event["start_time"].replace('Z', '+00:00')),
+                    "end_time": datetime.datetime.fromisoformat(end_time.replace('Z', '+00:00')) if end_time else None,
+                    "description": event.get("description"),
+                    "location": event.get("location")
+                })
+                spec_indices.append(index)
+            except (KeyError, TypeError, AttributeError, ValueError) as e:
+                results[index] = {"success": False, "error": f"Invalid event: {e}"}
+        
+        # Create the valid events
+        created_events = repo.create_events(events=event_specs, calendar_id=calendar_id) if event_specs else []
+        
+        # Format response, at each event's original position
+        for index, created_event in zip(spec_indices, created_events):
+            if isinstance(created_event, Exception):
+                results[index] = {"success": False, "error": str(created_event)}
+                continue
+            results[index] = {
+                "success": True,
+                "event": {
+                    "id": created_event.get("id"),
+                    "summary": created_event.get("summary"),
+                    "start": created_event.get("start", {}).get("dateTime") or created_event.get("start", {}).get("date"),
+                    "end": created_event.get("end", {}).get("dateTime") or created_event.get("end", {}).get("date"),
+                    "description": created_event.get("description", ""),
+                    "location": created_event.get("location", ""),
+                    "htmlLink": created_event.get("htmlLink", "")
+                }
+            }
+        
+        return {
+            "success": True,
+            "count": sum(1 for result in results if result["success"]),
+            "results": results
+        }
+        
+    except Exception as e:
+        return {
+            "success": False,
+            "error": str(e)
+        }
+
+
+@tool
+def create_calendar_events_tool(
+    events: List[dict],
+    calendar_id: str = "primary"
+) -> str:
+    """
+    Create multiple calendar events in a single batch request.
+    
+    Args:
+        events: List of events to create. Each event is a dictionary with
+                "summary" (required), "start_time" (required, ISO format),
+                "end_time" (optional, ISO format), "description" (optional)
+                and "location" (optional)
+        calendar_id: Calendar identifier (default: "primary")
+    
+    Returns:
+        JSON string containing one result per event, in the same order
+    """
+    import json
+    
+    return json.dumps(create_calendar_events_batch(events, calendar_id), indent=2)
+
+
 @tool
 def find_available_slots_tool(
     start_time: str,
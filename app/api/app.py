@@ -22,6 +22,7 @@ Architecture:
 
 import sys
 import os
+import logging
 from pathlib import Path
 from datetime import datetime
 from flask import Flask, request, jsonify, Response, stream_with_context
@@ -47,8 +48,12 @@ if src_path not in sys.path:
 env_path = Path(project_root) / ".env"
 load_dotenv(dotenv_path=env_path)
 
+# Agent node diagnostics are logged at DEBUG; keep them off unless AGENT_LOG_LEVEL asks for them
+logging.basicConfig(format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logging.getLogger("app.ai_agent").setLevel(os.getenv("AGENT_LOG_LEVEL", "INFO").upper())
+
 from app.ai_agent.graph import create_agent
-from langchain_core.messages import HumanMessage, AIMessage, ToolMessage, BaseMessage
+from langchain_core.messages import HumanMessage, AIMessage, AIMessageChunk, ToolMessage, BaseMessage
 from app.api.models import ChatRequest, ChatResponse
 from pydantic import ValidationError
 from calendar_repository import GoogleCalendarRepository
@@ -594,7 +599,7 @@ def chat():
                 state=state_dict
             )
             
-            return jsonify(chat_response.model_dump()), 200
+            return Response(chat_response.model_dump_json(), status=200, mimetype='application/json')
         
         # Extract the final response
         agent_response = ""
@@ -670,7 +675,8 @@ def chat():
             state=state_dict  # Always return state so frontend can maintain full conversation
         )
         
-        return jsonify(chat_response.model_dump()), 200
+        # Serialize with pydantic's compiled JSON encoder; the payload can carry hundreds of slot dicts
+        return Response(chat_response.model_dump_json(), status=200, mimetype='application/json')
         
     except Exception as e:
         return jsonify(ChatResponse(
@@ -690,7 +696,8 @@ def chat_stream():
     Stream chat updates from the AI agent using Server-Sent Events (SSE).
     
     This endpoint streams progress updates as the agent processes the request,
-    allowing the frontend to show real-time status updates.
+    allowing the frontend to show real-time status updates. The approval
+    message is also streamed as "token" events while it is being generated.
     """
     def generate():
         try:
@@ -772,6 +779,7 @@ def chat_stream():
                 "clarification_agent": "Clarifying details...",
                 "explanation_agent": "Preparing explanation...",
                 "fetch_calendar_events": "Fetching your calendar events...",
+                "prefetch_calendar_events": "Fetching your calendar events...",
                 "normalize_calendar_events": "Processing calendar data...",
                 "compute_free_slots": "Finding available time slots...",
                 "filter_slots": "Filtering time slots...",
@@ -781,12 +789,32 @@ def chat_stream():
                 "post_schedule_summary": "Finalizing schedule...",
             }
             
+            # Nodes whose LLM output is the user-facing reply and is streamed token by token
+            streamed_message_nodes = {"approval_node"}
+            
             # Stream the agent execution
+            # "updates" events carry only what each node wrote (used for progress),
+            # "values" events carry the full merged state after each step,
+            # "messages" events carry LLM tokens as they are generated
             final_result = None
-            for event in app.stream(initial_state):
-                # LangGraph streams events with node names as keys
-                # Each event is a dict like: {"node_name": state_after_node}
-                for node_name, node_state in event.items():
+            for mode, event in app.stream(initial_state, stream_mode=["updates", "values", "messages"]):
+                if mode == "values":
+                    # Store the final result (full state after the latest step)
+                    final_result = event
+                    continue
+                
+                if mode == "messages":
+                    # Forward user-facing message tokens so the reply renders as it is generated
+                    chunk, metadata = event
+                    node_name = metadata.get("langgraph_node")
+                    # Only token chunks; the completed message also arrives here once the node returns
+                    if node_name in streamed_message_nodes and isinstance(chunk, AIMessageChunk) and chunk.content:
+                        yield f"data: {json.dumps({'type': 'token', 'node': node_name, 'content': chunk.content})}\n\n"
+                    continue
+                
+                # LangGraph streams updates with node names as keys
+                # Each event is a dict like: {"node_name": node_update}
+                for node_name in event:
                     # Skip internal LangGraph events
                     if node_name.startswith("__"):
                         continue
@@ -794,9 +822,6 @@ def chat_stream():
                     # Send progress update
                     description = node_descriptions.get(node_name, f"Processing {node_name}...")
                     yield f"data: {json.dumps({'type': 'progress', 'node': node_name, 'description': description})}\n\n"
-                    
-                    # Store the final result (last node's state)
-                    final_result = node_state
             
             if not final_result:
                 yield f"data: {json.dumps({'type': 'error', 'error': 'No result from agent'})}\n\n"
@@ -878,7 +903,8 @@ def chat_stream():
                 state=state_dict
             )
             
-            yield f"data: {json.dumps({'type': 'complete', 'response': chat_response.model_dump()})}\n\n"
+            # Serialize with pydantic's compiled JSON encoder; the payload can carry hundreds of slot dicts
+            yield f'data: {{"type": "complete", "response": {chat_response.model_dump_json()}}}\n\n'
             
         except Exception as e:
             yield f"data: {json.dumps({'type': 'error', 'error': f'Internal server error: {str(e)}'})}\n\n"
@@ -32,6 +32,9 @@ class GoogleCalendarRepository:
     # Scopes for read and write access to calendar
     CALENDAR_SCOPES = ["https://www.googleapis.com/auth/calendar", "https://www.googleapis.com/auth/tasks"]
     
+    # Maximum number of calls the Calendar API accepts in a single batch request
+    BATCH_SIZE = 50
+    
     def __init__(
         self,
         auth_provider: Optional[GoogleAuthProvider] = None,
@@ -115,7 +118,8 @@ class GoogleCalendarRepository:
         time_max: Optional[datetime.datetime] = None,
         max_results: int = 10,
         single_events: bool = True,
-        order_by: str = "startTime"
+        order_by: str = "startTime",
+        fields: Optional[str] = None
     ) -> List[Dict[str, Any]]:
         """
         List events from a calendar.
@@ -130,6 +134,8 @@ class GoogleCalendarRepository:
             single_events: Whether to expand recurring events into instances.
                           Defaults to True.
             order_by: The order of the events returned. Defaults to "startTime".
+            fields: Partial-response selector (e.g. "items(id,summary)") so the API
+                   only returns those fields. If None, full events are returned.
         
         Returns:
             List of event dictionaries.
@@ -152,6 +158,7 @@ class GoogleCalendarRepository:
                     maxResults=max_results,
                     singleEvents=single_events,
                     orderBy=order_by,
+                    fields=fields,
                 )
             )
             return events_result.get("items", [])
@@ -221,6 +228,100 @@ class GoogleCalendarRepository:
         Raises:
             HttpError: If the API request fails.
         """
+        event = self._build_event_body(
+            summary=summary,
+            start_time=start_time,
+            end_time=end_time,
+            description=description,
+            location=location,
+            attendees=attendees,
+            **kwargs
+        )
+        
+        try:
+            created_event = self._execute_with_retry(
+                lambda: self.service.events().insert(calendarId=calendar_id, body=event)
+            )
+            return created_event
+        except HttpError as error:
+            raise HttpError(
+                resp=error.resp,
+                content=f"Failed to create event: {error}".encode()
+            )
+    
+    def create_events(
+        self,
+        events: List[Dict[str, Any]],
+        calendar_id: str = "primary"
+    ) -> List[Any]:
+        """
+        Create multiple calendar events using batch HTTP requests.
+        
+        Events are sent in batches of up to BATCH_SIZE inserts per HTTP request
+        instead of one request per event.
+        
+        Args:
+            events: List of event specs. Each spec is a dictionary of the keyword
+                    arguments accepted by create_event (summary, start_time, end_time,
+                    description, location, attendees, and additional properties).
+            calendar_id: Calendar identifier. Defaults to "primary".
+        
+        Returns:
+            List with one entry per input event, in the same order: the created
+            event dictionary, or the exception raised for that event.
+        
+        Raises:
+            Nothing for API failures, which are reported per event. If a batch
+            request fails as a whole, no further batches are sent: the events of
+            the failed batch and of the unsent batches get that HttpError as their
+            entry, while events from earlier batches keep their created events, so
+            callers can tell which events exist and retry only the failed ones.
+        """
+        results: List[Any] = [None] * len(events)
+        
+        def on_response(request_id, response, exception):
+            results[int(request_id)] = exception if exception is not None else response
+        
+        for batch_start in range(0, len(events), self.BATCH_SIZE):
+            batch_events = events[batch_start:batch_start + self.BATCH_SIZE]
+            
+            def build_batch():
+                batch = self.service.new_batch_http_request(callback=on_response)
+                for offset, event_spec in enumerate(batch_events):
+                    batch.add(
+                        self.service.events().insert(
+                            calendarId=calendar_id,
+                            body=self._build_event_body(**event_spec)
+                        ),
+                        request_id=str(batch_start + offset)
+                    )
+                return batch
+            
+            try:
+                self._execute_with_retry(build_batch)
+            except HttpError as error:
+                # Stop here, but keep the events earlier batches already created
+                batch_error = HttpError(
+                    resp=error.resp,
+                    content=f"Failed to create events: {error}".encode()
+                )
+                for index in range(batch_start, len(events)):
+                    results[index] = batch_error
+                break
+        
+        return results
+    
+    def _build_event_body(
+        self,
+        summary: str,
+        start_time: datetime.datetime,
+        end_time: Optional[datetime.datetime] = None,
+        description: Optional[str] = None,
+        location: Optional[str] = None,
+        attendees: Optional[List[str]] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Build the API request body for a new event."""
         if end_time is None:
             end_time = start_time + datetime.timedelta(hours=1)
         
@@ -247,16 +348,7 @@ class GoogleCalendarRepository:
         # Add any additional properties
         event.update(kwargs)
         
-        try:
-            created_event = self._execute_with_retry(
-                lambda: self.service.events().insert(calendarId=calendar_id, body=event)
-            )
-            return created_event
-        except HttpError as error:
-            raise HttpError(
-                resp=error.resp,
-                content=f"Failed to create event: {error}".encode()
-            )
+        return event
     
     def update_event(
         self,
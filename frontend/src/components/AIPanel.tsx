@@ -127,6 +127,15 @@ export function AIPanel({ isOpen, onToggle, onAddTask, onSendMessageRef }: AIPan
           if (update.type === 'progress' && update.description) {
             // Update progress message (only in the loading indicator, not in the message content)
             setProgressMessage(update.description);
+          } else if (update.type === 'token' && update.content) {
+            // Append streamed tokens so the reply renders while it is generated
+            setMessages((prev) =>
+              prev.map((msg) =>
+                msg.id === progressMessageId
+                  ? { ...msg, content: msg.content + update.content }
+                  : msg
+              )
+            );
           } else if (update.type === 'error') {
             // Handle error
             setMessages((prev) =>
@@ -287,6 +296,15 @@ export function AIPanel({ isOpen, onToggle, onAddTask, onSendMessageRef }: AIPan
           if (update.type === 'progress' && update.description) {
             // Update progress message (only in the loading indicator, not in the message content)
             setProgressMessage(update.description);
+          } else if (update.type === 'token' && update.content) {
+            // Append streamed tokens so the reply renders while it is generated
+            setMessages((prev) =>
+              prev.map((msg) =>
+                msg.id === progressMessageId
+                  ? { ...msg, content: msg.content + update.content }
+                  : msg
+              )
+            );
           } else if (update.type === 'error') {
             setMessages((prev) =>
               prev.map((msg) =>
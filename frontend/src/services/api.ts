@@ -174,9 +174,10 @@ export async function sendChatMessage(request: ChatRequest): Promise<ChatRespons
 }
 
 export interface StreamUpdate {
-  type: 'progress' | 'complete' | 'error';
+  type: 'progress' | 'token' | 'complete' | 'error';
   node?: string;
   description?: string;
+  content?: string;
   response?: ChatResponse;
   error?: string;
 }
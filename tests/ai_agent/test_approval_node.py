@@ -0,0 +1,32 @@
+"""Unit tests for approval_node's integer slot duration math (no network access)."""
+
+import sys
+from datetime import timedelta
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from app.ai_agent.nodes.approval_node import _whole_minutes
+
+
+@pytest.mark.parametrize("delta, expected", [
+    (timedelta(minutes=90), 90),
+    (timedelta(minutes=59, seconds=59, microseconds=999_999), 59),
+    (timedelta(days=1, minutes=1), 1441),
+    (timedelta(0), 0),
+    (timedelta(minutes=-1, seconds=-30), -1),
+    (timedelta(seconds=-59), 0),
+])
+def test_whole_minutes_truncates_toward_zero(delta, expected):
+    assert _whole_minutes(delta) == expected
+    # Same result as the float-based int(total_seconds() / 60) it replaced
+    assert _whole_minutes(delta) == int(delta.total_seconds() / 60)
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
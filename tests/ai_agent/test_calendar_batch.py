@@ -0,0 +1,134 @@
+"""Unit tests for batched event creation, with an in-memory repository and a fake Calendar service."""
+
+import datetime
+import sys
+from pathlib import Path
+
+import httplib2
+import pytest
+from googleapiclient.errors import HttpError
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from app.ai_agent.tools import calendar_tools
+from app.ai_agent.tools import create_calendar_events_batch
+from app.src.calendar_repository import GoogleCalendarRepository
+
+
+class _FakeRepository:
+    """Stands in for GoogleCalendarRepository.create_events; fails events whose summary is "fail"."""
+
+    def __init__(self):
+        self.batches = []
+
+    def create_events(self, events, calendar_id="primary"):
+        self.batches.append(events)
+        return [
+            RuntimeError("insert failed") if event["summary"] == "fail" else {
+                "id": f"event{index}",
+                "summary": event["summary"],
+                "start": {"dateTime": event["start_time"].isoformat()},
+                "end": {"dateTime": (event["end_time"] or event["start_time"]).isoformat()},
+            }
+            for index, event in enumerate(events)
+        ]
+
+
+@pytest.fixture
+def repo(monkeypatch):
+    fake = _FakeRepository()
+    monkeypatch.setattr(calendar_tools, "_calendar_repo", fake)
+    return fake
+
+
+def test_malformed_event_fails_alone(repo):
+    result = create_calendar_events_batch([
+        {"summary": "a", "start_time": "2030-01-01T10:00:00Z", "end_time": "2030-01-01T11:00:00Z"},
+        {"summary": "b", "start_time": "not a date"},
+        {"start_time": "2030-01-01T12:00:00Z"},
+        {"summary": "d", "start_time": "2030-01-02T10:00:00+00:00"},
+    ])
+
+    assert result["success"] is True
+    assert result["count"] == 2
+    assert [r["success"] for r in result["results"]] == [True, False, False, True]
+    assert result["results"][0]["event"]["summary"] == "a"
+    assert result["results"][3]["event"]["summary"] == "d"
+    # Only the valid events reach the calendar
+    assert [event["summary"] for event in repo.batches[0]] == ["a", "d"]
+
+
+def test_per_event_api_failure_keeps_its_position(repo):
+    result = create_calendar_events_batch([
+        {"summary": "fail", "start_time": "2030-01-01T10:00:00Z"},
+        {"summary": "ok", "start_time": "2030-01-01T12:00:00Z"},
+    ])
+
+    assert result["count"] == 1
+    assert result["results"][0] == {"success": False, "error": "insert failed"}
+    assert result["results"][1]["success"] is True
+
+
+def test_all_events_malformed_skips_the_api(repo):
+    result = create_calendar_events_batch([{"summary": "b", "start_time": None}])
+
+    assert result["success"] is True
+    assert result["count"] == 0
+    assert result["results"][0]["success"] is False
+    assert repo.batches == []
+
+
+class _FakeBatch:
+    def __init__(self, service, callback):
+        self._service = service
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id):
+        self._requests.append((request_id, request))
+
+    def execute(self):
+        self._service.batches_sent += 1
+        if self._service.batches_sent == self._service.fail_batch:
+            raise HttpError(resp=httplib2.Response({"status": 500}), content=b"backend error")
+        for request_id, body in self._requests:
+            self._callback(request_id, {"id": f"event{request_id}", **body}, None)
+
+
+class _FakeService:
+    """Just enough of the Calendar service for create_events; batch number fail_batch raises."""
+
+    def __init__(self, fail_batch):
+        self.fail_batch = fail_batch
+        self.batches_sent = 0
+
+    def new_batch_http_request(self, callback):
+        return _FakeBatch(self, callback)
+
+    def events(self):
+        return self
+
+    def insert(self, calendarId, body):
+        return body
+
+
+def test_create_events_keeps_earlier_batches_when_a_batch_fails(monkeypatch):
+    repository = GoogleCalendarRepository.__new__(GoogleCalendarRepository)
+    repository.service = _FakeService(fail_batch=2)
+    monkeypatch.setattr(GoogleCalendarRepository, "BATCH_SIZE", 2)
+    start = datetime.datetime(2030, 1, 1, 10, tzinfo=datetime.timezone.utc)
+    events = [{"summary": str(index), "start_time": start} for index in range(5)]
+
+    results = repository.create_events(events)
+
+    assert [result["id"] for result in results[:2]] == ["event0", "event1"]
+    assert all(isinstance(result, HttpError) for result in results[2:])
+    # No batches are sent after the failed one
+    assert repository.service.batches_sent == 2
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
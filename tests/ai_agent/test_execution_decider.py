@@ -0,0 +1,30 @@
+"""Unit tests for execution_decider's deterministic decisions (no LLM calls)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from app.ai_agent.nodes.control_nodes.execution_decider import _decide_from_plan
+
+
+@pytest.mark.parametrize("plan_type, plan, expected", [
+    ("habit", {"habit_name": "Run", "frequency": "daily", "duration_minutes": 30}, "EXECUTE"),
+    ("task", {"task_name": "Dinner", "estimated_time_minutes": 60}, "EXECUTE"),
+    ("task", {"task_name": "Dinner", "estimated_time_minutes": 60, "dry_run": True}, "DRY_RUN"),
+    ("task", {"task_name": "Dinner", "estimated_time_minutes": 60, "clarification_questions": ["When?"]}, None),
+    ("habit", {"habit_name": "Run", "frequency": "daily"}, None),
+    ("task", {"task_name": "", "estimated_time_minutes": 60}, None),
+    ("unknown", {"task_name": "Dinner"}, None),
+])
+def test_decide_from_plan(plan_type, plan, expected):
+    assert _decide_from_plan(plan_type, plan) == expected
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
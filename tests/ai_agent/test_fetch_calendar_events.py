@@ -0,0 +1,28 @@
+"""Unit tests for fetch_calendar_events' start/end field mapping (no network access)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from app.ai_agent.nodes.fetch_calendar_events import _time_field
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("2030-01-01T10:00:00+00:00", {"dateTime": "2030-01-01T10:00:00+00:00"}),
+    ("2030-01-01T10:00:00Z", {"dateTime": "2030-01-01T10:00:00Z"}),
+    ("2030-01-01", {"date": "2030-01-01"}),
+    ("", {}),
+    (None, {}),
+])
+def test_time_field(value, expected):
+    assert _time_field(value) == expected
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
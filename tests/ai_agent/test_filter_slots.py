@@ -0,0 +1,56 @@
+"""Unit tests for filter_slots' slot splitting (no network access)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from app.ai_agent.nodes.filter_slots import _MINUTE_US, _split_slot
+
+
+def _split(span_minutes, required, maximum, buffer, slot_duration=None):
+    """Split a slot of span_minutes and return (start, end, duration) in minutes."""
+    if slot_duration is None:
+        slot_duration = span_minutes
+    return [
+        (start // _MINUTE_US, end // _MINUTE_US, minutes)
+        for start, end, minutes in _split_slot(span_minutes * _MINUTE_US, slot_duration, required, maximum, buffer)
+    ]
+
+
+def test_split_slot_fills_slot_with_buffered_events():
+    # 3h slot, 30-60 min events, 15 min gaps: 0-60, 75-135, 150-180
+    assert _split(180, 30, 60, 15) == [(0, 60, 60), (75, 135, 60), (150, 180, 30)]
+
+
+def test_split_slot_drops_remainder_shorter_than_required():
+    # After 0-60 and a 15 min gap only 25 minutes are left
+    assert _split(100, 30, 60, 15) == [(0, 60, 60)]
+
+
+def test_split_slot_too_short_for_one_event():
+    assert _split(20, 30, 60, 15) == []
+
+
+def test_split_slot_without_buffer_is_back_to_back():
+    assert _split(120, 60, 60, 0) == [(0, 60, 60), (60, 120, 60)]
+
+
+def test_split_slot_first_event_clamped_to_span():
+    # The reported duration overstates the span; the event ends at the slot end
+    assert _split(45, 30, 60, 15, slot_duration=90) == [(0, 45, 45)]
+
+
+def test_split_slot_keeps_sub_minute_offsets_exact():
+    span_us = 61 * _MINUTE_US + 500_000
+    events = list(_split_slot(span_us, 61, 30, 30, 1))
+    assert events == [(0, 30 * _MINUTE_US, 30), (31 * _MINUTE_US, 61 * _MINUTE_US, 30)]
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,74 @@
+"""Unit tests for the planners' early-abort streaming (no LLM calls)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from langchain_core.messages import AIMessageChunk
+
+from app.ai_agent.nodes.control_nodes._llm import stream_until_status
+from app.ai_agent.nodes.control_nodes.habit_planner import _parse_habit_plan
+from app.ai_agent.nodes.control_nodes.task_analyzer import _parse_task_analysis
+
+
+class _ChunkStream:
+    """Iterator over response chunks that records how many were read and whether it was closed."""
+
+    def __init__(self, pieces):
+        self._pieces = iter(pieces)
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        if self.closed:
+            raise StopIteration
+        piece = next(self._pieces)
+        self.read += 1
+        return AIMessageChunk(content=piece)
+
+    def close(self):
+        self.closed = True
+
+
+def test_stream_until_status_stops_at_abort_status():
+    stream = _ChunkStream(['{"plan_status": ', '"PLAN_INFEASIBLE"', ', "task": {', '"task_name": "x"}}'])
+    text, status = stream_until_status(stream, "PLAN_INFEASIBLE")
+    assert status == "PLAN_INFEASIBLE"
+    assert text == '{"plan_status": "PLAN_INFEASIBLE"'
+    assert stream.closed and stream.read == 2
+
+
+def test_stream_until_status_reads_everything_otherwise():
+    pieces = ['{"plan_status": "PLAN_READY", ', '"task": {"task_name": "x"}}']
+    stream = _ChunkStream(pieces)
+    text, status = stream_until_status(stream, "PLAN_INFEASIBLE")
+    assert status == "PLAN_READY"
+    assert text == "".join(pieces)
+    assert not stream.closed
+
+
+def test_stream_until_status_without_status():
+    text, status = stream_until_status(_ChunkStream(['{"task": ', "{}}"]), "PLAN_INFEASIBLE")
+    assert (text, status) == ('{"task": {}}', None)
+
+
+
+
+@pytest.mark.parametrize("parse", [_parse_task_analysis, _parse_habit_plan])
+def test_aborted_infeasible_plan_has_explanation(parse):
+    result = parse('{"plan_status": "PLAN_INFEASIBLE"', "PLAN_INFEASIBLE")
+    assert result["plan_status"] == "PLAN_INFEASIBLE"
+    assert result["explanation_payload"] == {"reason": "Plan judged infeasible (stream aborted early)"}
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
@@ -0,0 +1,38 @@
+"""Unit tests for the planners' JSON shape validation (no LLM calls)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from app.ai_agent.nodes.control_nodes._results import has_valid_plan_shape
+from app.ai_agent.nodes.control_nodes.habit_planner import _parse_habit_plan
+from app.ai_agent.nodes.control_nodes.task_analyzer import _parse_task_analysis
+
+
+@pytest.mark.parametrize("analysis, expected", [
+    ({"plan_status": "PLAN_READY", "task": {"task_name": "Dinner", "estimated_time_minutes": 60}}, True),
+    ({"plan_status": "NEEDS_CLARIFICATION", "task": {}, "clarification_questions": ["When?"]}, True),
+    ({"plan_status": "PLAN_READY", "task": {"estimated_time_minutes": "60"}}, False),
+    ({"plan_status": "PLAN_READY", "task": {"estimated_time_minutes": True}}, False),
+    ({"plan_status": "PLAN_READY", "task": None}, False),
+    ({"plan_status": "DONE", "task": {}}, False),
+    ({"plan_status": "PLAN_READY", "task": {}, "clarification_questions": "When?"}, False),
+    ([], False),
+])
+def test_has_valid_plan_shape(analysis, expected):
+    assert has_valid_plan_shape(analysis, "task", ("estimated_time_minutes",)) is expected
+
+
+def test_parsers_degrade_on_wrongly_shaped_json():
+    assert _parse_task_analysis('{"task": {"estimated_time_minutes": "60"}}')["plan_status"] == "NEEDS_CLARIFICATION"
+    assert _parse_habit_plan('{"plan": null}')["plan_status"] == "NEEDS_CLARIFICATION"
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))
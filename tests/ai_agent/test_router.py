@@ -0,0 +1,30 @@
+"""Unit tests for the graph's intent routing (no LLM calls)."""
+
+import sys
+from pathlib import Path
+
+import pytest
+
+# Add project root to Python path
+project_root = Path(__file__).parent.parent.parent
+if str(project_root) not in sys.path:
+    sys.path.insert(0, str(project_root))
+
+from app.ai_agent.router import route_by_intent
+
+
+@pytest.mark.parametrize("state, expected", [
+    ({"intent_type": "TASK_SCHEDULE"}, ["TASK_SCHEDULE", "PREFETCH_CALENDAR"]),
+    ({"intent_type": "TASK_SCHEDULE", "intent_analysis": {"plan_status": "PLAN_READY"}}, ["TASK_SCHEDULE", "PREFETCH_CALENDAR"]),
+    ({"intent_type": "TASK_SCHEDULE", "intent_analysis": {"plan_status": "NEEDS_CLARIFICATION"}}, "TASK_SCHEDULE"),
+    ({"intent_type": "HABIT_SCHEDULE"}, "HABIT_SCHEDULE"),
+    ({"intent_type": "CALENDAR_ANALYSIS"}, "CALENDAR_ANALYSIS"),
+    ({"intent_type": "SOMETHING_ELSE"}, "UNKNOWN"),
+    ({}, "UNKNOWN"),
+])
+def test_route_by_intent(state, expected):
+    assert route_by_intent(state) == expected
+
+
+if __name__ == "__main__":
+    sys.exit(pytest.main([__file__, "-q"]))